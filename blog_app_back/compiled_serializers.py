@@ -0,0 +1,117 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose to_representation returns database values unchanged
+PASSTHROUGH_REPRESENTATIONS = {
+    serializers.ReadOnlyField.to_representation,
+    serializers.CharField.to_representation,
+    serializers.IntegerField.to_representation,
+}
+
+
+class CompiledSerializer:
+    """
+    Read-only fast path for a serializer: turns `.values()` rows into the same
+    dicts serializer.data would give for the model instances, without building
+    instances or going through per row field dispatch.
+
+    The serializer is inspected once; `paths` lists the values() lookups to fetch
+    and `field_paths` maps each top level field to its lookup.
+    """
+
+    def __init__(self, serializer, paths=None, annotations=()):
+        """
+        serializer: serializer instance to mirror (field subset already applied)
+        paths: {field name: values() lookup} where it differs from the field source,
+               e.g. {'content': 'body__content'}
+        annotations: SerializerMethodField names read from queryset annotations
+                     of the same name
+        """
+        self.paths = []
+        self._steps = self._compile(serializer, '', paths or {}, set(annotations))
+        self.field_paths = {name: key for name, key, _, _ in self._steps}
+
+    def _compile(self, serializer, prefix, paths, annotations):
+        steps = []
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            name = field.field_name
+
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in annotations:
+                    raise ImproperlyConfigured(
+                        f"{type(serializer).__name__}.{name} is a method field, list it in `annotations` "
+                        f"and annotate the queryset with it to compile the serializer"
+                    )
+                key = prefix + name
+            else:
+                key = prefix + paths.get(name, field.source.replace('.', '__'))
+            self.paths.append(key)
+
+            if isinstance(field, serializers.BaseSerializer):
+                # nested object: None when the relation is empty, else its own fields
+                steps.append((name, key, None, self._compile(field, f'{key}__', {}, set())))
+            elif type(field).to_representation in PASSTHROUGH_REPRESENTATIONS or name in annotations:
+                steps.append((name, key, None, None))
+            else:
+                steps.append((name, key, field.to_representation, None))
+        return steps
+
+    def to_representation(self, row):
+        return self._render(row, self._steps)
+
+    def _render(self, row, steps):
+        ret = {}
+        for name, key, convert, nested in steps:
+            value = row[key]
+            if value is None:
+                ret[name] = None
+            elif nested is not None:
+                ret[name] = self._render(row, nested)
+            elif convert is None:
+                ret[name] = value
+            else:
+                ret[name] = convert(value)
+        return ret
+
+    def render_many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class CompiledListMixin:
+    """
+    Opt-in compiled list() for generic list views: the page is fetched with
+    .values() and rendered by a CompiledSerializer built from get_serializer().
+    The response body is the same as with the regular serializer.
+    """
+    use_compiled_serializer = True
+    # {field name: values() lookup} where it differs from the field source
+    compiled_paths = {}
+    # SerializerMethodFields the queryset provides as annotations
+    compiled_annotations = ()
+
+    def get_compiled_serializer(self):
+        return CompiledSerializer(self.get_serializer(), paths=self.compiled_paths, annotations=self.compiled_annotations)
+
+    def get_pagination_values(self):
+        """Extra values() lookups the paginator needs, e.g. the ordering column"""
+        return []
+
+    def get_compiled_values(self, compiled):
+        """values() lookups to fetch"""
+        return [*compiled.paths, *self.get_pagination_values()]
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_compiled_serializer:
+            return super().list(request, *args, **kwargs)
+
+        compiled = self.get_compiled_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*dict.fromkeys(self.get_compiled_values(compiled)))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.render_many(page))
+        return Response(compiled.render_many(rows))
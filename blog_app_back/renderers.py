@@ -0,0 +1,73 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional, JSONRenderer's stdlib encoder is used without it
+    orjson = None
+
+
+def is_plain_float(value):
+    """
+    Whether orjson writes the float like json.dumps does. They only differ
+    on exponents (1e16 vs 1e+16, 1e-7 vs 1e-07), and orjson writes NaN and
+    infinities as null where JSONRenderer raises.
+    """
+    return value == 0 or 1e-4 <= abs(value) < 1e16
+
+
+# leaves that can't hold a float, skipped without a call
+_SCALAR_TYPES = {str, int, bool, type(None)}
+
+
+def has_special_floats(data):
+    """Whether `data`, through its lists, tuples and dict values, holds a float that isn't plain"""
+    if isinstance(data, float):
+        return not is_plain_float(data)
+    if isinstance(data, dict):
+        values = data.values()
+    elif isinstance(data, (list, tuple)):
+        values = data
+    else:
+        return False
+    return any(type(value) not in _SCALAR_TYPES and has_special_floats(value) for value in values)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    The output is the same as JSONRenderer's compact form: datetimes, dates,
+    decimals, lazy strings etc. are still handed to DRF's JSONEncoder, and
+    U+2028/U+2029 are escaped. Pretty printing, ASCII-only output, values
+    orjson can't encode (e.g. integers over 64 bits) and floats it would write
+    differently (see is_plain_float) go through JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+            or has_special_floats(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encode = self.encoder_class().default
+
+        def default(obj):
+            value = encode(obj)
+            if has_special_floats(value):
+                raise TypeError('float orjson would write differently')
+            return value
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=default,
+                # non-str keys raise and go through JSONRenderer, which formats float keys differently
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, keeps the output a strict javascript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
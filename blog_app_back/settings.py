@@ -110,6 +110,15 @@ else:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Holds the anonymous post responses (posts.cache). The default is per process;
+# use a shared backend with several workers, e.g. CACHE_URL=redis://localhost:6379/1
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -159,6 +168,16 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.TokenAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson based when orjson is installed, the stdlib JSON renderer/parser otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'blog_app_back.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'blog_app_back.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10, #Post listing requirement
 }
@@ -0,0 +1,86 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from blog_app_back import parsers, renderers
+from blog_app_back.parsers import FastJSONParser
+from blog_app_back.renderers import FastJSONRenderer
+
+PAYLOAD = ReturnDict({
+    "id": 1,
+    "title": "Ünïcode   line   separators </script>",
+    "created_at": datetime.datetime(2026, 10, 17, 12, 30, 45, 123456, tzinfo=datetime.timezone.utc),
+    "naive": datetime.datetime(2026, 10, 17, 12, 30, 45),
+    "local": timezone.localtime(datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)),
+    "day": datetime.date(2026, 10, 17),
+    "time": datetime.time(8, 15, 30, 250000),
+    "duration": datetime.timedelta(minutes=5),
+    "price": decimal.Decimal("12.50"),
+    "lazy": gettext_lazy("Not found."),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "nested": [{"a": None, "b": True, "c": 1.5}, (1, 2)],
+    "counts": {1: "one", 2: "two"},
+}, serializer=None)
+
+
+def test_renderer_output_matches_json_renderer():
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+    assert FastJSONRenderer().render(None) == b""
+
+
+@pytest.mark.parametrize("accepted", ["application/json; indent=4", "application/json; indent=2"])
+def test_renderer_pretty_printing_matches_json_renderer(accepted):
+    assert FastJSONRenderer().render(PAYLOAD, accepted) == JSONRenderer().render(PAYLOAD, accepted)
+
+
+def test_renderer_falls_back_for_values_orjson_cannot_encode():
+    data = {"big": 2 ** 70}
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize("value", [1.5, -0.0, 1e-4, 9999999999999998.0, 1e16, 1e-07, 5e-324, -1.7976931348623157e308])
+def test_renderer_formats_floats_like_json_renderer(value):
+    data = {"score": value, "scores": [0.25, value], "keys": {value: 1}}
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_renderer_rejects_non_finite_floats_like_json_renderer(value):
+    with pytest.raises(ValueError):
+        JSONRenderer().render({"results": [{"score": value}]})
+    with pytest.raises(ValueError):
+        FastJSONRenderer().render({"results": [{"score": value}]})
+
+
+def test_renderer_and_parser_work_without_orjson(monkeypatch):
+    monkeypatch.setattr(renderers, "orjson", None)
+    monkeypatch.setattr(parsers, "orjson", None)
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+    assert FastJSONParser().parse(io.BytesIO(b'{"a": [1, "\\u00e9"]}')) == {"a": [1, "é"]}
+
+
+@pytest.mark.parametrize("body", [b'{"title": "T\xc3\xa9st", "n": [1, 2.5, null, true]}', b"[]", b'"text"'])
+def test_parser_matches_json_parser(body):
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.parametrize("body", [b"{", b'{"a": NaN}', b"\xff"])
+def test_parser_rejects_invalid_json(body):
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.django_db
+def test_api_responses_use_fast_renderer(client):
+    response = client.get("/api/post/")
+    assert response.status_code == 200
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
@@ -12,6 +12,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # a post's comments in order, and their count/newest for conditional GETs
+            models.Index(fields=['post', 'created_at'], name='comment_post_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} on {self.post.title}: {self.content[:30]}"
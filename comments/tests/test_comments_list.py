@@ -208,4 +208,70 @@ def test_invalid_user_id_param(auth_client):
 
     response = client.get(COMMENTS_LIST_URL(post.id) + "?user_id=abc")  # invalid value
     assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "user_id" in response.data
\ No newline at end of file
+    assert "user_id" in response.data
+
+
+@pytest.mark.django_db
+def test_compiled_list_is_byte_identical(monkeypatch, client, create_user):
+    from comments.views import CommentListView
+
+    post = Post.objects.create(
+        author=create_user(), title="Compiled", content="...",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+    for i in range(7):
+        Comment.objects.create(user=create_user(), post=post, content=f"Comment {i} \u2028 \"quoted\"")
+
+    for query in ("", "?page=2"):
+        bodies = []
+        for compiled in (True, False):
+            monkeypatch.setattr(CommentListView, "use_compiled_serializer", compiled)
+            response = client.get(COMMENTS_LIST_URL(post.id) + query)
+            assert response.status_code == status.HTTP_200_OK
+            bodies.append(response.content)
+        assert bodies[0] == bodies[1]
+
+
+@pytest.mark.django_db
+def test_list_can_sideload_users(client, create_user):
+    post = Post.objects.create(
+        author=create_user(), title="Sideload", content="...",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+    users = [create_user() for _ in range(3)]
+    for user in users:
+        Comment.objects.create(user=user, post=post, content="Hi")
+
+    response = client.get(COMMENTS_LIST_URL(post.id) + "?include=users")
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(row["user_id"] for row in response.data["results"]) == sorted(user.id for user in users)
+    assert all("user" not in row for row in response.data["results"])
+    assert response.data["included"]["users"][str(users[0].id)]["email"] == users[0].email
+
+
+@pytest.mark.django_db
+def test_comment_list_conditional_get(client, create_user):
+    user = create_user()
+    post = Post.objects.create(
+        author=user, title="Test", content="Content",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+    comment = Comment.objects.create(user=user, post=post, content="First comment")
+
+    etag = client.get(COMMENTS_LIST_URL(post.id))["ETag"]
+    assert client.get(COMMENTS_LIST_URL(post.id), HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+    Comment.objects.create(user=user, post=post, content="Second comment")
+    response = client.get(COMMENTS_LIST_URL(post.id), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 2
+
+    etag = response["ETag"]
+    comment.delete()
+    assert client.get(COMMENTS_LIST_URL(post.id), HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    # the post title is part of every comment
+    etag = client.get(COMMENTS_LIST_URL(post.id))["ETag"]
+    post.title = "Renamed"
+    post.save(update_fields=["title"])
+    assert client.get(COMMENTS_LIST_URL(post.id), HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
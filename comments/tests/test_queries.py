@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from posts.models import Post
+from comments.models import Comment
+from users.models import Team
+
+COMMENT_CREATE_URL = lambda post_id: f'/api/post/{post_id}/comment/'
+COMMENT_DELETE_URL = lambda comment_id: f'/api/comment/{comment_id}/'
+COMMENT_LIST_URL = lambda post_id: f'/api/post/{post_id}/comments/'
+
+
+def lookups(ctx):
+    # SELECTs other than the token authentication
+    return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT") and "authtoken_token" not in q["sql"]]
+
+
+def make_team_post(auth_client):
+    team = Team.objects.create(name="Query Team")
+    _, author = auth_client(email="author@example.com", team=team)
+    client, mate = auth_client(email="mate@example.com", team=team)
+    post = Post.objects.create(author=author, title="Team only", content="...", team_access="read")
+    return client, mate, post
+
+
+@pytest.mark.django_db
+def test_comment_delete_fetches_comment_and_post_in_one_query(auth_client):
+    client, mate, post = make_team_post(auth_client)
+    comment = Comment.objects.create(user=mate, post=post, content="Mine")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.delete(COMMENT_DELETE_URL(comment.id))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    [sql] = lookups(ctx)
+    assert "comments_comment" in sql and "posts_post" in sql
+    assert "users_team" not in sql
+
+
+@pytest.mark.django_db
+def test_comment_delete_on_unreadable_post_is_one_query(auth_client):
+    _, _, post = make_team_post(auth_client)
+    outsider_client, outsider = auth_client(email="outsider@example.com")
+    comment = Comment.objects.create(user=outsider, post=post, content="Before the post was hidden")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = outsider_client.delete(COMMENT_DELETE_URL(comment.id))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert len(lookups(ctx)) == 1
+    assert Comment.objects.filter(id=comment.id).exists()
+
+
+def post_lookups(ctx):
+    return [sql for sql in lookups(ctx) if 'FROM "posts_post"' in sql]
+
+
+@pytest.mark.django_db
+def test_comment_create_checks_post_in_one_query(auth_client):
+    client, _, post = make_team_post(auth_client)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(COMMENT_CREATE_URL(post.id), {"content": "Hi"}, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(post_lookups(ctx)) == 1
+    assert not any("users_team" in sql for sql in lookups(ctx))
+
+
+@pytest.mark.django_db
+def test_comment_list_checks_post_in_one_query(auth_client):
+    client, _, post = make_team_post(auth_client)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(COMMENT_LIST_URL(post.id))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(post_lookups(ctx)) == 1
+    assert not any("users_team" in sql for sql in lookups(ctx))
+
+
+@pytest.mark.django_db
+def test_comment_list_query_count_is_constant(auth_client, create_user):
+    client, _, post = make_team_post(auth_client)
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(COMMENT_LIST_URL(post.id))
+        assert response.status_code == status.HTTP_200_OK
+        return len(lookups(ctx)), len(response.data["results"])
+
+    for _ in range(2):
+        Comment.objects.create(user=create_user(), post=post, content="Hi")
+    small_page = count_queries()
+    for _ in range(10):
+        Comment.objects.create(user=create_user(), post=post, content="Hi")
+    full_page = count_queries()
+
+    # post check, ETag freshness aggregate, COUNT(*), page of comments joined with users and post
+    assert small_page == (4, 2)
+    assert full_page == (4, 5)
+
+
+@pytest.mark.django_db
+def test_comment_create_response_needs_no_extra_queries(auth_client):
+    client, _, post = make_team_post(auth_client)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(COMMENT_CREATE_URL(post.id), {"content": "Hi"}, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["post"] == post.title
+    # only the post check; user and post of the new comment are already loaded
+    assert len(lookups(ctx)) == 1
@@ -1,3 +1,4 @@
+from django.db.models import Count, Max
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
@@ -6,6 +7,11 @@ from .models import Comment
 from .patinationsComments import CommentPagination
 from .serializers import CommentSerializer
 from likes.utils import get_post_or_404_for_user
+from blog_app_back.compiled_serializers import CompiledListMixin
+from blog_app_back.conditional import ConditionalGetMixin
+from posts.cache import AUTHORS_GENERATION, get_generations
+from users.mixins import SideloadUsersMixin, INCLUDE_PARAMETER
+from posts.permissions import get_readable_object_or_404
 
 class CommentCreateView(generics.CreateAPIView):
     """
@@ -49,7 +55,7 @@ class CommentCreateView(generics.CreateAPIView):
         
         serializer.save(user=user, post=post)
 
-class CommentListView(generics.ListAPIView):
+class CommentListView(ConditionalGetMixin, SideloadUsersMixin, CompiledListMixin, generics.ListAPIView):
     """
     List comments for a specific blog post.
     Users can view all comments on any post for which they have view access.
@@ -69,13 +75,15 @@ class CommentListView(generics.ListAPIView):
                 location=OpenApiParameter.QUERY,
                 required=False,
                 description='Filter comments by user ID'
-            )
+            ),
+            INCLUDE_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
                 response=CommentSerializer(many=True),
                 description="List of comments with pagination (max 10 per page)"
             ),
+            304: OpenApiResponse(description="Not modified since the If-None-Match / If-Modified-Since validators"),
             400: OpenApiResponse(description="Invalid user_id parameter"),
             404: OpenApiResponse(description="Post not found or no access"),
         },
@@ -85,20 +93,34 @@ class CommentListView(generics.ListAPIView):
         """Get comments for a post with optional user filtering"""
         return super().get(request, *args, **kwargs)
 
-    def get_queryset(self):
-        post_id = self.kwargs.get('post_id')
-        user = self.request.user
-
-        post = get_post_or_404_for_user(user, post_id)
+    def get_post(self):
+        if not hasattr(self, '_post'):
+            self._post = get_post_or_404_for_user(self.request.user, self.kwargs.get('post_id'))
+        return self._post
 
-        queryset = Comment.objects.filter(post=post)
+    def get_comments(self):
+        """Comments of the post, filtered by ?user_id="""
+        queryset = Comment.objects.filter(post_id=self.get_post().id)
 
         user_id = self.request.query_params.get('user_id')
         if user_id:
             if not user_id.isdigit():
                 raise ValidationError({'user_id': 'Must be a valid integer'})
             queryset = queryset.filter(user__id=user_id)
-        return queryset.order_by('created_at')
+        return queryset
+
+    def get_queryset(self):
+        # user.email and post.title are serialized, join them instead of one query per comment
+        return self.get_comments().select_related('user', 'post').order_by('created_at')
+
+    def get_validators(self):
+        # count and newest comment from the (post, created_at) index; post.title
+        # is shown, comment users' emails are covered by the authors generation
+        post = self.get_post()
+        state = self.get_comments().order_by().aggregate(count=Count('id'), last_id=Max('id'), latest=Max('created_at'))
+        [authors] = get_generations([AUTHORS_GENERATION])
+        parts = [post.update_at.isoformat(), state['count'], state['last_id'], authors]
+        return parts, max(filter(None, [post.update_at, state['latest']]))
 
 class CommentDeleteView(generics.DestroyAPIView):
     """
@@ -129,14 +151,12 @@ class CommentDeleteView(generics.DestroyAPIView):
         AC: Users can delete a comment that they have previously posted
         AC: Must have view access to the post
         """
-        # Get the comment
-        comment = super().get_object()
-        user = self.request.user
-        
-        # AC: Must have view access to the post
+        # Get the comment and its post in one query
         # This will raise 404 if user doesn't have view access to the post
-        get_post_or_404_for_user(user, comment.post.id)
-        
+        lookup = {self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        comment = get_readable_object_or_404(self.request.user, self.get_queryset(), post_path='post', **lookup)
+        self.check_object_permissions(self.request, comment)
+
         return comment
 
     def get_queryset(self):
@@ -144,6 +164,6 @@ class CommentDeleteView(generics.DestroyAPIView):
     
     def perform_destroy(self, instance):
          user = self.request.user
-         if instance.user != user and not user.is_superuser:
+         if instance.user_id != user.pk and not user.is_superuser:
              raise PermissionDenied('Only author or admin can delete this comment.')
          instance.delete()
@@ -1,8 +1,16 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from users.models import User, Team
+from posts import suggest
 import uuid
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # cached responses must not outlive the test database rows they were built from
+    cache.clear()
+    suggest.suggestions.clear()
+
 @pytest.fixture 
 def create_user(db):
     def make_user(email=None, password='userpassword123', username=None, team=None):
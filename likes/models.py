@@ -1,19 +1,97 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from django.conf import settings
 from posts.models import Post
+from posts import cache
 
 User = settings.AUTH_USER_MODEL
 
+class LikeManager(models.Manager):
+    """
+    Like/unlike are single statements (INSERT ... ON CONFLICT DO NOTHING and
+    DELETE ... RETURNING, supported by PostgreSQL and SQLite >= 3.35), so
+    concurrent double taps never hit unique_user_post_like and never need a
+    read first. post.likes_count is adjusted in the same transaction only when
+    a row was actually inserted or deleted.
+    Raw SQL is used, so Like save/delete signals are not sent; the anonymous
+    response cache is invalidated here instead. Likes saved or deleted through
+    the ORM are counted by posts.signals.
+    """
+
+    def add_like(self, user, post):
+        """
+        Like a post if it isn't liked yet.
+        return: the new Like, or None if the user already liked the post
+        """
+        created_at = timezone.now()
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        sql = (
+            f'INSERT INTO {table} (user_id, post_id, created_at) VALUES (%s, %s, %s) '
+            f'ON CONFLICT (user_id, post_id) DO NOTHING RETURNING id'
+        )
+        params = [
+            user.pk, post.pk,
+            self.model._meta.get_field('created_at').get_db_prep_value(created_at, connection),
+        ]
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            if row is None:
+                return None
+            Post.objects.filter(pk=post.pk).update(likes_count=F('likes_count') + 1)
+            cache.invalidate_post(post.pk, public=cache.is_public(post))
+
+        return self.model(id=row[0], user=user, post=post, created_at=created_at)
+
+    def remove_like(self, user, post):
+        """
+        Remove the user's like from a post.
+        return: True if a like was removed
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        sql = f'DELETE FROM {table} WHERE user_id = %s AND post_id = %s RETURNING id'
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [user.pk, post.pk])
+                row = cursor.fetchone()
+            if row is None:
+                return False
+            # never below zero, even if the count drifted (PositiveIntegerField CHECK)
+            Post.objects.filter(pk=post.pk).update(likes_count=Greatest(F('likes_count') - 1, 0))
+            cache.invalidate_post(post.pk, public=cache.is_public(post))
+
+        return True
+
+    def set_like(self, user, post, liked):
+        """
+        Idempotently put the like in the requested state.
+        return: True if anything changed
+        """
+        if liked:
+            return self.add_like(user, post) is not None
+        return self.remove_like(user, post)
+
 class Like(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='likes')
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='likes')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = LikeManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['user', 'post'], name= 'unique_user_post_like')
         ] #a user can only give one like per post.
         ordering = ['-created_at'] #most recently first
+        indexes = [
+            # a post's likes newest first, and their count/newest for conditional GETs
+            models.Index(fields=['post', '-created_at'], name='like_post_created_idx'),
+        ]
 
 
     def __str__(self):
@@ -13,4 +13,10 @@ class LikeActionSerializer(serializers.Serializer):
     """
     Serializer to document the input of the like action
     """
-    pass
\ No newline at end of file
+    pass
+
+class LikeStateSerializer(serializers.Serializer):
+    """
+    Desired like state for the idempotent PUT
+    """
+    liked = serializers.BooleanField()
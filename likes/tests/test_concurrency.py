@@ -0,0 +1,69 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIClient
+from posts.models import Post
+from likes.models import Like
+
+LIKE_URL = lambda post_id: f'/api/post/{post_id}/like/'
+
+THREADS = 8
+TAPS_PER_USER = 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_likes_on_hot_post(auth_client):
+    if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+        pytest.skip("shared-cache in-memory SQLite raises 'table is locked' instead of waiting for writers")
+
+    _, author = auth_client()
+    post = Post.objects.create(
+        author=author,
+        title="Hot post",
+        content="Everyone likes this",
+        team_access='read',
+        authenticated_access='read',
+        public_access="read"
+    )
+    clients = [auth_client()[0] for _ in range(THREADS)]
+    barrier = threading.Barrier(THREADS)
+
+    def double_tap(client):
+        # Every user fires several likes at once: exactly one must win, none may 500
+        barrier.wait()
+        try:
+            return [client.post(LIKE_URL(post.id)).status_code for _ in range(TAPS_PER_USER)]
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(double_tap, clients))
+
+    for codes in results:
+        assert codes.count(status.HTTP_201_CREATED) == 1
+        assert codes.count(status.HTTP_400_BAD_REQUEST) == TAPS_PER_USER - 1
+
+    post.refresh_from_db()
+    assert post.likes_count == THREADS
+    assert Like.objects.filter(post=post).count() == THREADS
+
+    def unlike(client):
+        barrier.wait()
+        try:
+            return [client.delete(LIKE_URL(post.id)).status_code for _ in range(TAPS_PER_USER)]
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(unlike, clients))
+
+    for codes in results:
+        assert codes.count(status.HTTP_204_NO_CONTENT) == 1
+        assert status.HTTP_500_INTERNAL_SERVER_ERROR not in codes
+
+    post.refresh_from_db()
+    assert post.likes_count == 0
+    assert not Like.objects.filter(post=post).exists()
@@ -0,0 +1,71 @@
+import pytest
+from rest_framework import status
+from posts.models import Post
+from likes.models import Like
+from users.models import Team
+
+LIKED_POSTS_URL = '/api/likes/mine/'
+
+
+def make_post(author, **access):
+    defaults = {"team_access": "read", "authenticated_access": "read", "public_access": "read"}
+    defaults.update(access)
+    return Post.objects.create(author=author, title="Post", content="...", **defaults)
+
+
+@pytest.mark.django_db
+def test_returns_subset_of_liked_posts(auth_client):
+    client, user = auth_client()
+    posts = [make_post(user) for _ in range(4)]
+    Like.objects.add_like(user, posts[0])
+    Like.objects.add_like(user, posts[2])
+
+    ids = ",".join(str(p.id) for p in posts)
+    response = client.get(f"{LIKED_POSTS_URL}?post_ids={ids}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"liked_post_ids": sorted([posts[0].id, posts[2].id])}
+
+
+@pytest.mark.django_db
+def test_lookup_is_a_single_query(auth_client, django_assert_num_queries):
+    client, user = auth_client()
+    posts = [make_post(user) for _ in range(20)]
+    for post in posts[::2]:
+        Like.objects.add_like(user, post)
+
+    ids = ",".join(str(p.id) for p in posts)
+    with django_assert_num_queries(2):  # token lookup + lookup query
+        response = client.get(f"{LIKED_POSTS_URL}?post_ids={ids}")
+    assert len(response.data["liked_post_ids"]) == 10
+
+
+@pytest.mark.django_db
+def test_posts_no_longer_readable_are_left_out(auth_client):
+    team = Team.objects.create(name="Team A")
+    _, author = auth_client(email="author@test.com", team=team)
+    client, user = auth_client(email="mate@test.com", team=team)
+    post = make_post(author, team_access="read", authenticated_access="none", public_access="none")
+    Like.objects.add_like(user, post)
+
+    response = client.get(f"{LIKED_POSTS_URL}?post_ids={post.id}")
+    assert response.data["liked_post_ids"] == [post.id]
+
+    post.team_access = "none"
+    post.save()
+    response = client.get(f"{LIKED_POSTS_URL}?post_ids={post.id}")
+    assert response.data["liked_post_ids"] == []
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "?post_ids=", "?post_ids=1,abc", "?post_ids=" + ",".join(["1"] * 501)])
+def test_invalid_post_ids(auth_client, query):
+    client, _ = auth_client()
+    response = client.get(LIKED_POSTS_URL + query)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "post_ids" in response.data
+
+
+@pytest.mark.django_db
+def test_requires_authentication(client):
+    response = client.get(f"{LIKED_POSTS_URL}?post_ids=1")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
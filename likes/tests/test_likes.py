@@ -1,4 +1,6 @@
 import pytest 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from posts.models import Post 
 from likes.models import Like
@@ -160,4 +162,83 @@ def test_like_in_post_only_visible_to_author_or_admin(auth_client):
     admin.save()
 
     response = admin_client.post(LIKE_URL(post.id))
-    assert response.status_code == status.HTTP_201_CREATED
\ No newline at end of file
+    assert response.status_code == status.HTTP_201_CREATED
+
+@pytest.mark.django_db
+def test_like_and_unlike_maintain_likes_count(auth_client):
+    client, user = auth_client()
+    client2, _ = auth_client(email="second@test.com")
+    post = Post.objects.create(
+        author=user,
+        title="Counted",
+        content="Post content",
+        team_access='read',
+        authenticated_access='read',
+        public_access="read"
+    )
+
+    client.post(LIKE_URL(post.id))
+    client.post(LIKE_URL(post.id))  # duplicate like does not count twice
+    client2.post(LIKE_URL(post.id))
+    post.refresh_from_db()
+    assert post.likes_count == 2
+
+    client.delete(LIKE_URL(post.id))
+    client.delete(LIKE_URL(post.id))  # unliking twice does not count twice
+    post.refresh_from_db()
+    assert post.likes_count == 1
+
+
+@pytest.mark.django_db
+def test_put_sets_like_state_idempotently(auth_client):
+    client, user = auth_client()
+    post = Post.objects.create(
+        author=user,
+        title="Toggle",
+        content="Post content",
+        team_access='read',
+        authenticated_access='read',
+        public_access="read"
+    )
+
+    for _ in range(2):
+        response = client.put(LIKE_URL(post.id), {"liked": True}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"liked": True}
+    post.refresh_from_db()
+    assert post.likes_count == 1
+    assert Like.objects.filter(user=user, post=post).count() == 1
+
+    for _ in range(2):
+        response = client.put(LIKE_URL(post.id), {"liked": False}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"liked": False}
+    post.refresh_from_db()
+    assert post.likes_count == 0
+    assert not Like.objects.filter(user=user, post=post).exists()
+
+
+@pytest.mark.django_db
+def test_put_requires_liked_flag(auth_client):
+    client, user = auth_client()
+    post = Post.objects.create(author=user, title="Toggle", content="...")
+
+    response = client.put(LIKE_URL(post.id), {}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "liked" in response.data
+
+
+@pytest.mark.django_db
+def test_like_permission_check_is_one_query(auth_client):
+    team = Team.objects.create(name="Team A")
+    _, author = auth_client(email="author@example.com", team=team)
+    client, _ = auth_client(email="mate@example.com", team=team)
+    post = Post.objects.create(author=author, title="Team", content="...", team_access="read")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(LIKE_URL(post.id))
+    assert response.status_code == status.HTTP_201_CREATED
+
+    selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT") and "authtoken_token" not in q["sql"]]
+    assert len(selects) == 1
+    assert "users_team" not in selects[0] and "users_user" not in selects[0]
@@ -1,4 +1,6 @@
 import pytest 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from posts.models import Post 
 from likes.models import Like
@@ -145,4 +147,90 @@ def test_anonymous_user_can_view_likes_on_public_post(client, auth_client):
     # anonymous user can view these likes
     response = client.get(LIKES_LIST_URL(post.id))
     assert response.status_code == status.HTTP_200_OK
-    assert response.data["count"] == 1
\ No newline at end of file
+    assert response.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_likes_list_query_count_is_constant(client, create_user):
+    author = create_user()
+    post = Post.objects.create(
+        author=author, title="Popular", content="...",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(LIKES_LIST_URL(post.id))
+        assert response.status_code == status.HTTP_200_OK
+        return len(ctx.captured_queries), len(response.data["results"])
+
+    for _ in range(2):
+        Like.objects.create(user=create_user(), post=post)
+    small_page = count_queries()
+    for _ in range(20):
+        Like.objects.create(user=create_user(), post=post)
+    full_page = count_queries()
+
+    # post check, ETag freshness aggregate, COUNT(*), page of likes joined with their users
+    assert small_page == (4, 2)
+    assert full_page == (4, 15)
+
+
+@pytest.mark.django_db
+def test_compiled_list_is_byte_identical(monkeypatch, client, create_user):
+    from likes.views import LikeListView
+
+    post = Post.objects.create(
+        author=create_user(), title="Compiled", content="...",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+    for i in range(17):
+        Like.objects.create(user=create_user(), post=post)
+
+    for query in ("", "?page=2"):
+        bodies = []
+        for compiled in (True, False):
+            monkeypatch.setattr(LikeListView, "use_compiled_serializer", compiled)
+            response = client.get(LIKES_LIST_URL(post.id) + query)
+            assert response.status_code == status.HTTP_200_OK
+            bodies.append(response.content)
+        assert bodies[0] == bodies[1]
+
+
+@pytest.mark.django_db
+def test_list_can_sideload_users(client, create_user):
+    post = Post.objects.create(
+        author=create_user(), title="Sideload", content="...",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+    users = [create_user() for _ in range(3)]
+    for user in users:
+        Like.objects.create(user=user, post=post)
+
+    response = client.get(LIKES_LIST_URL(post.id) + "?include=users")
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(row["user_id"] for row in response.data["results"]) == sorted(user.id for user in users)
+    assert all("user" not in row for row in response.data["results"])
+    assert response.data["included"]["users"][str(users[0].id)]["email"] == users[0].email
+
+
+@pytest.mark.django_db
+def test_likes_list_conditional_get(client, auth_client, create_user):
+    author = create_user()
+    post = Post.objects.create(
+        author=author, title="Popular", content="...",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+    liker, _ = auth_client()
+    liker.post(f'/api/post/{post.id}/like/')
+
+    response = client.get(LIKES_LIST_URL(post.id))
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+    assert client.get(LIKES_LIST_URL(post.id), HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+    assert client.get(LIKES_LIST_URL(post.id), HTTP_IF_MODIFIED_SINCE=last_modified).status_code == status.HTTP_304_NOT_MODIFIED
+
+    # an unlike leaves no timestamp behind, the ETag still notices it
+    liker.delete(f'/api/post/{post.id}/like/')
+    response = client.get(LIKES_LIST_URL(post.id), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == []
@@ -56,4 +56,37 @@ def test_like_deleted_if_post_deleted(create_user):
     like = Like.objects.create(user=user, post=post)
 
     post.delete()
-    assert Like.objects.filter(id=like.id).count() == 0
\ No newline at end of file
+    assert Like.objects.filter(id=like.id).count() == 0
+
+@pytest.mark.django_db
+def test_orm_likes_maintain_likes_count(create_user):
+    author = create_user(email="author@test.com")
+    liker = create_user(email="liker@test.com")
+    other = create_user(email="other@test.com")
+    post = Post.objects.create(author=author, title="Counted", content="Content")
+
+    like = Like.objects.create(user=liker, post=post)
+    Like.objects.create(user=other, post=post)
+    post.refresh_from_db()
+    assert post.likes_count == 2
+
+    like.delete()
+    post.refresh_from_db()
+    assert post.likes_count == 1
+
+    # likes cascade-deleted with their user
+    other.delete()
+    post.refresh_from_db()
+    assert post.likes_count == 0
+
+
+@pytest.mark.django_db
+def test_remove_like_never_makes_likes_count_negative(create_user):
+    user = create_user(email="drift@test.com")
+    post = Post.objects.create(author=user, title="Drifted", content="Content")
+    Like.objects.add_like(user, post)
+    Post.objects.filter(pk=post.pk).update(likes_count=0)
+
+    assert Like.objects.remove_like(user, post)
+    post.refresh_from_db()
+    assert post.likes_count == 0
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import LikeView, LikeListView
+from .views import LikeView, LikeListView, LikedPostsView
 
 urlpatterns = [
     path('post/<int:post_id>/like/', LikeView.as_view(), name='like-unlike-post-delete'),
     path('post/<int:post_id>/likes/', LikeListView.as_view(), name='list-likes'),
+    path('likes/mine/', LikedPostsView.as_view(), name='liked-posts'),
 ]
\ No newline at end of file
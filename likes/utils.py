@@ -1,7 +1,5 @@
-from django.shortcuts import get_object_or_404
-from rest_framework.exceptions import NotFound
 from .models import Post
-from posts.permissions import user_can_read_post
+from posts.permissions import get_readable_object_or_404
 
 def get_post_or_404_for_user(user, post_id):
     """
@@ -9,7 +7,4 @@ def get_post_or_404_for_user(user, post_id):
     If it doesn't exist or the user doesn't have access, throws Not Found
     """
 
-    post = get_object_or_404(Post, id=post_id)
-    if not user_can_read_post(user, post):
-        raise NotFound("Post Not Found")
-    return post 
\ No newline at end of file
+    return get_readable_object_or_404(user, Post.objects.all(), id=post_id)
\ No newline at end of file
@@ -1,14 +1,22 @@
+from django.db.models import Count, Max
 from rest_framework import status, permissions, generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from likes.paginations_likes import LikePagination
 
 from .models import Like
-from .serializers import LikeSerializer, LikeActionSerializer
+from .serializers import LikeSerializer, LikeActionSerializer, LikeStateSerializer
 from likes.utils import get_post_or_404_for_user
+from blog_app_back.compiled_serializers import CompiledListMixin
+from blog_app_back.conditional import ConditionalGetMixin
+from users.mixins import SideloadUsersMixin, INCLUDE_PARAMETER
+from posts.cache import AUTHORS_GENERATION, get_generations
+from posts.models import Post
+from posts.permissions import get_readable_posts_query
 
 
 class LikeView(APIView):
@@ -37,9 +45,9 @@ class LikeView(APIView):
         #all logic about gets object or user can read the post is here
         post = get_post_or_404_for_user(request.user, post_id)
         
-        #prevent multiple likes
-        like, created = Like.objects.get_or_create(user=request.user, post=post)
-        if not created:
+        #prevent multiple likes with a single INSERT ... ON CONFLICT DO NOTHING
+        like = Like.objects.add_like(request.user, post)
+        if like is None:
             return Response({'detail': 'You have already liked this post'}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = LikeSerializer(like)
@@ -62,14 +70,37 @@ class LikeView(APIView):
         """
         post = get_post_or_404_for_user(request.user, post_id)
 
-        like = Like.objects.filter(user=request.user, post=post).first()
-        if not like:
+        if not Like.objects.remove_like(request.user, post):
             return Response({'detail': 'You have not liked this post.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        like.delete()
         return Response({'detail': 'Like removed successfully.'}, status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(
+        operation_id="set_like",
+        description="Idempotently like (`liked: true`) or unlike (`liked: false`) a post. Repeating the request is a no-op.",
+        request=LikeStateSerializer,
+        responses={
+            200: OpenApiResponse(response=LikeStateSerializer, description="Current like state"),
+            400: OpenApiResponse(description="Invalid data"),
+            404: OpenApiResponse(description="Post not found"),
+        },
+        tags=["Likes"],
+    )
+
+    def put(self, request, post_id):
+        """
+        Put the like on a post in the requested state
+        """
+        serializer = LikeStateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        liked = serializer.validated_data['liked']
+
+        post = get_post_or_404_for_user(request.user, post_id)
+        Like.objects.set_like(request.user, post, liked)
+
+        return Response({'liked': liked}, status=status.HTTP_200_OK)
     
-class LikeListView(generics.ListAPIView):
+class LikeListView(ConditionalGetMixin, SideloadUsersMixin, CompiledListMixin, generics.ListAPIView):
     serializer_class = LikeSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = LikePagination 
@@ -84,13 +115,15 @@ class LikeListView(generics.ListAPIView):
                 location=OpenApiParameter.QUERY,
                 required=False,
                 description='Filter likes by user ID'       
-            )
+            ),
+            INCLUDE_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
                 response=LikeSerializer(many=True),
                 description="List of likes"
             ),
+            304: OpenApiResponse(description="Not modified since the If-None-Match / If-Modified-Since validators"),
             404: OpenApiResponse(description="Post not found"),
         },
         tags=["Likes"],
@@ -99,16 +132,77 @@ class LikeListView(generics.ListAPIView):
         """Get all likes for a specific post with optional user filtering"""
         return super().get(request, *args, **kwargs)
     
-    def get_queryset(self):
-        post_id = self.kwargs.get('post_id')
-        user = self.request.user
-        post = get_post_or_404_for_user(user, post_id)
+    def get_post(self):
+        if not hasattr(self, '_post'):
+            self._post = get_post_or_404_for_user(self.request.user, self.kwargs.get('post_id'))
+        return self._post
 
-        queryset = Like.objects.filter(post=post)
+    def get_likes(self):
+        """Likes of the post, filtered by ?user_id="""
+        queryset = Like.objects.filter(post_id=self.get_post().id)
 
         user_id = self.request.query_params.get('user_id')
         if user_id:
             queryset = queryset.filter(user__id=user_id)
+        return queryset
+
+    def get_queryset(self):
+        # user.email is serialized, join it instead of one query per like
+        return self.get_likes().select_related('user').order_by('-created_at')
+
+    def get_validators(self):
+        # count and newest like from the (post, created_at) index; users'
+        # emails are covered by the authors generation
+        state = self.get_likes().order_by().aggregate(count=Count('id'), last_id=Max('id'), latest=Max('created_at'))
+        [authors] = get_generations([AUTHORS_GENERATION])
+        return [state['count'], state['last_id'], authors], state['latest']
+
+class LikedPostsView(APIView):
+    """
+    Bulk "did I like these posts" lookup for feeds
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_post_ids = 500
+
+    @extend_schema(
+        operation_id='list_liked_posts',
+        description='Return which of the given posts the authenticated user has liked. '
+                    'Posts the user can no longer read are left out.',
+        parameters=[
+            OpenApiParameter(
+                name='post_ids',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description='Comma separated post IDs (max 500)'
+            )
+        ],
+        responses={
+            200: OpenApiResponse(description="IDs of the given posts liked by the user"),
+            400: OpenApiResponse(description="Invalid or too many post_ids"),
+            401: OpenApiResponse(description="Authentication required"),
+        },
+        tags=["Likes"],
+    )
+    def get(self, request):
+        """Get the subset of post_ids liked by the user"""
+        post_ids = self.get_post_ids()
+
+        #one query on the (user_id, post_id) unique index, limited to readable posts
+        readable_posts = Post.objects.filter(get_readable_posts_query(request.user)).values('id')
+        liked = Like.objects.filter(user=request.user, post_id__in=post_ids).filter(post__in=readable_posts)
+
+        return Response({'liked_post_ids': sorted(liked.values_list('post_id', flat=True))})
+
+    def get_post_ids(self):
+        raw = self.request.query_params.get('post_ids', '')
+        values = [value.strip() for value in raw.split(',') if value.strip()]
 
-        return queryset.order_by('-created_at')
+        if not values:
+            raise ValidationError({'post_ids': 'This parameter is required'})
+        if not all(value.isdigit() for value in values):
+            raise ValidationError({'post_ids': 'Must be a comma separated list of integers'})
+        if len(values) > self.max_post_ids:
+            raise ValidationError({'post_ids': f'At most {self.max_post_ids} post IDs are allowed'})
 
+        return {int(value) for value in values}
@@ -1,8 +1,30 @@
+from django import forms
 from django.contrib import admin
 from .models import Post
 
+
+class PostAdminForm(forms.ModelForm):
+    # Post.content is a property backed by PostBody; saving through it keeps the excerpt and search index in sync
+    content = forms.CharField(widget=forms.Textarea, required=False)
+
+    class Meta:
+        model = Post
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk is not None:
+            self.fields['content'].initial = self.instance.content
+
+    def save(self, commit=True):
+        if 'content' in self.changed_data or self.instance.pk is None:
+            self.instance.content = self.cleaned_data['content']
+        return super().save(commit=commit)
+
+
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
+    form = PostAdminForm
     list_display = ('id', 'title', 'author', 'created_at', 'author_access', 'team_access', 'authenticated_access', 'public_access')
     list_filter = ('author_access', 'team_access', 'authenticated_access', 'public_access', 'created_at')
-    search_fields = ('title', 'content', 'author__username')
+    search_fields = ('title', 'body__content', 'author__username')
@@ -0,0 +1,340 @@
+"""
+Response cache for anonymous post reads, and per post fragments for lists.
+
+Cached responses are keyed by endpoint, query string, viewer class and the
+generation numbers of the data they show. Invalidation bumps a generation
+(see posts.signals), so stale entries are never read again and simply
+expire:
+
+- LIST_GENERATION: every anonymous post list page
+- post_generation(pk): the detail of one post
+- AUTHORS_GENERATION: every response that embeds a user or team
+- VISIBILITY_GENERATION: moves when a post stops being visible to anonymous
+  users (hidden or deleted). It scopes the stale responses served while a
+  response is recomputed, so they never show such a post again.
+
+Fragments are the viewer independent part of a post's list JSON, keyed by
+(post id, update_at, author and team generations, field set), see
+PostFragmentCacheMixin.
+"""
+import hashlib
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from .permissions import READ_TIER_PUBLIC
+
+CACHE_ALIAS = 'default'
+CACHE_TIMEOUT = 300
+KEY_PREFIX = 'posts:anon'
+LIST_GENERATION = f'{KEY_PREFIX}:gen:list'
+AUTHORS_GENERATION = f'{KEY_PREFIX}:gen:authors'
+VISIBILITY_GENERATION = f'{KEY_PREFIX}:gen:visibility'
+FRAGMENT_TIMEOUT = 3600
+# Post list fields that change without update_at moving or differ per viewer;
+# they are read with the page and never cached in fragments
+FRAGMENT_VOLATILE_FIELDS = ('likes_count', 'liked_by_me', 'my_access')
+HITS_KEY = f'{KEY_PREFIX}:hits'
+MISSES_KEY = f'{KEY_PREFIX}:misses'
+STALE_KEY = f'{KEY_PREFIX}:stale'
+# Single flight: how long a recomputation may hold the lock, and how long
+# requests without a stale response wait for it
+STALE_TIMEOUT = CACHE_TIMEOUT * 4
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 5
+POLL_INTERVAL = 0.02
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def post_generation(pk):
+    return f'{KEY_PREFIX}:gen:post:{pk}'
+
+
+def author_generation(pk):
+    return f'{KEY_PREFIX}:gen:author:{pk}'
+
+
+def team_generation(pk):
+    return f'{KEY_PREFIX}:gen:team:{pk}'
+
+
+def _incr(key, initial=1):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:  # not set yet (or evicted)
+        cache.add(key, initial, timeout=None)
+
+
+def _new_generation():
+    # a generation that was evicted restarts from a value no cached response was keyed with
+    return time.time_ns()
+
+
+def bump(*keys):
+    """
+    Move the generations on. Inside a transaction they move again on commit,
+    so a response cached from the old rows in between is not served either.
+    """
+    for key in keys:
+        _incr(key, initial=_new_generation())
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: [_incr(key, initial=_new_generation()) for key in keys])
+
+
+def get_generations(keys):
+    cache = get_cache()
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _new_generation(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def invalidate_post(pk, public=True, hidden=False):
+    """
+    A post changed: its detail, and the lists when anonymous users can see it.
+    hidden: anonymous users could see it and no longer can (or it was deleted)
+    """
+    keys = [post_generation(pk)]
+    if public:
+        keys.append(LIST_GENERATION)
+    if hidden:
+        keys.append(VISIBILITY_GENERATION)
+    bump(*keys)
+
+
+def invalidate_author(pk):
+    """A user shown as a post author may have changed"""
+    bump(LIST_GENERATION, AUTHORS_GENERATION, author_generation(pk))
+
+
+def invalidate_team(pk):
+    """A team shown in post authors may have changed"""
+    bump(LIST_GENERATION, AUTHORS_GENERATION, team_generation(pk))
+
+
+def is_public(post):
+    """Whether anonymous users may see the post; True when read_tier isn't loaded"""
+    read_tier = post.__dict__.get('read_tier')
+    return read_tier is None or read_tier == READ_TIER_PUBLIC
+
+
+def get_stats():
+    stats = get_cache().get_many([HITS_KEY, MISSES_KEY, STALE_KEY])
+    return {'hits': stats.get(HITS_KEY, 0), 'misses': stats.get(MISSES_KEY, 0), 'stale': stats.get(STALE_KEY, 0)}
+
+
+class SingleFlight:
+    """
+    In-process request coalescing: the first thread to ask for a key leads,
+    the others wait on its Event instead of recomputing the same response.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}
+
+    def join(self, key):
+        """return: (event, True if this thread leads)"""
+        with self._lock:
+            event = self._events.get(key)
+            if event is not None:
+                return event, False
+            event = self._events[key] = threading.Event()
+            return event, True
+
+    def done(self, key):
+        with self._lock:
+            event = self._events.pop(key)
+        event.set()
+
+
+flights = SingleFlight()
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Serve anonymous GETs from the cache. The response data is cached, so it
+    is still rendered in whatever format the client negotiates. Responses
+    carry X-Cache: HIT, MISS or STALE.
+
+    Misses are single flight: one thread per process (SingleFlight) and one
+    process per cache backend (a cache.add lock) recomputes the response.
+    The others get the last response for the same URL while that runs
+    (stale-while-revalidate), or wait up to `cache_wait_timeout` for the new
+    one when there is none.
+    """
+    cache_timeout = CACHE_TIMEOUT
+    stale_timeout = STALE_TIMEOUT
+    cache_lock_timeout = LOCK_TIMEOUT
+    cache_wait_timeout = WAIT_TIMEOUT
+    use_single_flight = True
+
+    def get_cache_generations(self):
+        """Generation keys the response depends on"""
+        raise NotImplementedError
+
+    def is_response_cacheable(self, request):
+        return request.method == 'GET' and not request.user.is_authenticated
+
+    def get_response_cache_keys(self, request):
+        """return: (key of the current response, key of the last response for the URL)"""
+        *generations, visibility = get_generations([*self.get_cache_generations(), VISIBILITY_GENERATION])
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        # responses hold absolute next/previous links, built from the scheme and host
+        raw = '|'.join(['anonymous', request.scheme, request.get_host(), request.path, query])
+        current = '|'.join([raw, *map(str, generations)])
+        # stale responses outlive edits, but not a post leaving anonymous visibility
+        stale = '|'.join([raw, str(visibility)])
+        return (
+            f'{KEY_PREFIX}:response:{hashlib.md5(current.encode()).hexdigest()}',
+            f'{KEY_PREFIX}:stale:{hashlib.md5(stale.encode()).hexdigest()}',
+        )
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        key, stale_key = self.get_response_cache_keys(request)
+        data = get_cache().get(key)
+        if data is not None:
+            return self.cached_response(data, HITS_KEY, 'HIT')
+        if not self.use_single_flight:
+            return self.refresh_response(key, stale_key, request, *args, **kwargs)
+
+        event, leader = flights.join(key)
+        if not leader:
+            return self.wait_for_response(key, stale_key, event.wait, request, *args, **kwargs)
+        try:
+            if get_cache().add(f'{key}:lock', 1, self.cache_lock_timeout):
+                try:
+                    return self.refresh_response(key, stale_key, request, *args, **kwargs)
+                finally:
+                    get_cache().delete(f'{key}:lock')
+            # another process is recomputing it
+            return self.wait_for_response(key, stale_key, self.poll_response(key), request, *args, **kwargs)
+        finally:
+            flights.done(key)
+
+    def poll_response(self, key):
+        def wait(timeout):
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline and not get_cache().has_key(key):
+                time.sleep(POLL_INTERVAL)
+        return wait
+
+    def wait_for_response(self, key, stale_key, wait, request, *args, **kwargs):
+        data = get_cache().get(stale_key)
+        if data is not None:
+            return self.cached_response(data, STALE_KEY, 'STALE')
+
+        wait(self.cache_wait_timeout)
+        data = get_cache().get(key)
+        if data is not None:
+            return self.cached_response(data, HITS_KEY, 'HIT')
+        # the recomputation failed (e.g. 404) or timed out
+        return self.refresh_response(key, stale_key, request, *args, **kwargs)
+
+    def cached_response(self, data, counter, status):
+        _incr(counter)
+        return Response(data, headers={'X-Cache': status})
+
+    def refresh_response(self, key, stale_key, request, *args, **kwargs):
+        _incr(MISSES_KEY)
+        cache = get_cache()
+        try:
+            response = super().get(request, *args, **kwargs)
+        except Exception:
+            # e.g. the post was hidden: nothing may be served for the URL anymore
+            cache.delete(stale_key)
+            raise
+
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+            cache.set(stale_key, response.data, self.stale_timeout)
+        else:
+            cache.delete(stale_key)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class PostFragmentCacheMixin:
+    """
+    Assemble compiled post list pages from cached per post fragments.
+
+    The page is read with the id, update_at, author/team ids and the volatile
+    fields only; full rows are fetched and serialized for the fragments that
+    are missing, in one query. Must come before CompiledListMixin.
+    """
+    use_fragment_cache = True
+    fragment_timeout = FRAGMENT_TIMEOUT
+    fragment_volatile_fields = FRAGMENT_VOLATILE_FIELDS
+
+    def get_fragment_keys(self, rows, field_names):
+        author_ids = {row['author_id'] for row in rows}
+        team_ids = {row['author_team_id'] for row in rows if row['author_team_id'] is not None}
+        generation_keys = [author_generation(pk) for pk in author_ids] + [team_generation(pk) for pk in team_ids]
+        generations = dict(zip(generation_keys, get_generations(generation_keys)))
+
+        signature = hashlib.md5(','.join(field_names).encode()).hexdigest()[:12]
+        return [
+            f"{KEY_PREFIX}:fragment:{row['id']}:{row['update_at'].isoformat()}:"
+            f"{generations[author_generation(row['author_id'])]}:"
+            f"{generations.get(team_generation(row['author_team_id']), 0)}:{signature}"
+            for row in rows
+        ]
+
+    def render_fragments(self, compiled, queryset, page):
+        names = list(compiled.field_paths)
+        volatile = [name for name in names if name in self.fragment_volatile_fields]
+        cached_names = [name for name in names if name not in volatile]
+
+        cache = get_cache()
+        keys = self.get_fragment_keys(page, cached_names)
+        fragments = cache.get_many(keys)
+
+        missing = {row['id']: (row, key) for row, key in zip(page, keys) if key not in fragments}
+        if missing:
+            volatile_paths = {compiled.field_paths[name] for name in volatile}
+            paths = [path for path in compiled.paths if path not in volatile_paths]
+            new_fragments = {}
+            for full_row in queryset.order_by().filter(pk__in=missing).values('id', *paths):
+                row, key = missing[full_row['id']]
+                data = compiled.to_representation({**row, **full_row})
+                new_fragments[key] = {name: data[name] for name in cached_names}
+            cache.set_many(new_fragments, self.fragment_timeout)
+            fragments.update(new_fragments)
+
+        results = []
+        for row, key in zip(page, keys):
+            fragment = fragments[key]
+            results.append({
+                name: row[compiled.field_paths[name]] if name in volatile else fragment[name]
+                for name in names
+            })
+        return results
+
+    def list(self, request, *args, **kwargs):
+        if not (self.use_fragment_cache and self.use_compiled_serializer):
+            return super().list(request, *args, **kwargs)
+
+        compiled = self.get_compiled_serializer()
+        queryset = self.filter_queryset(self.get_queryset())
+        volatile = [path for name, path in compiled.field_paths.items() if name in self.fragment_volatile_fields]
+        rows = queryset.values(*dict.fromkeys([
+            'id', 'update_at', 'author_id', 'author_team_id', *volatile, *self.get_pagination_values(),
+        ]))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.render_fragments(compiled, queryset, page))
+        return Response(self.render_fragments(compiled, queryset, list(rows)))
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.html import strip_tags
+
+from posts.utils import build_excerpt, truncate_excerpt
+
+
+def legacy_excerpt(content):
+    """The excerpt path Post.save used before posts.utils.build_excerpt."""
+    text = strip_tags(content or '')
+    return truncate_excerpt(' '.join(text.split()))
+
+
+def make_document(paragraphs):
+    paragraph = (
+        '<p>Lorem <b>ipsum</b> dolor sit amet, <a href="https://example.com/?a=1&amp;b=2">consectetur</a> '
+        'adipiscing elit &mdash; sed do eiusmod tempor<br/> incididunt ut labore.</p>\n'
+    )
+    return '<article><h1>Benchmark</h1>\n' + paragraph * paragraphs + '</article>'
+
+
+class Command(BaseCommand):
+    help = 'Compare the latency of the streaming excerpt extractor with full strip_tags on small, medium and huge posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        documents = {
+            'small': make_document(5),
+            'medium': make_document(1000),
+            'huge': make_document(40000),
+        }
+        for label, document in documents.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{label} ({len(document) / 1024:.0f} KiB)'))
+            if legacy_excerpt(document) != build_excerpt(document):
+                self.stderr.write(self.style.ERROR('  excerpts differ'))
+
+            for name, function in (('strip_tags', legacy_excerpt), ('streaming', build_excerpt)):
+                start = time.perf_counter()
+                for _ in range(options['repeat']):
+                    function(document)
+                elapsed = (time.perf_counter() - start) / options['repeat'] * 1000
+                self.stdout.write(f'  {name:<10} {elapsed:10.3f} ms')
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from blog_app_back.renderers import FastJSONRenderer, orjson
+
+
+def make_post_list(page_size):
+    """A post list response body shaped like PostSerializer output"""
+    created_at = timezone.now().isoformat().replace('+00:00', 'Z')
+    return {
+        'next': 'http://testserver/api/post/?cursor=cD0yMDI2LTEwLTE3',
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'author': {
+                    'id': i % 50, 'username': f'author{i % 50}', 'email': f'author{i % 50}@example.com',
+                    'role': 'blogger', 'team': {'id': i % 5, 'name': f'Team {i % 5}'},
+                },
+                'title': f'Post number {i} — a realistic títle',
+                'content': '<p>' + 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 30 + '</p>',
+                'excerpt': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 3,
+                'created_at': created_at,
+                'likes_count': i * 3,
+                'author_access': 'write',
+                'team_access': 'read',
+                'authenticated_access': 'read',
+                'public_access': 'read',
+                'liked_by_me': i % 2 == 0,
+                'my_access': 'read',
+            }
+            for i in range(page_size)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare JSONRenderer with FastJSONRenderer on post list payloads of 10 to 500 posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write(self.style.WARNING('orjson is not installed, FastJSONRenderer falls back to the stdlib encoder'))
+
+        for page_size in (10, 50, 100, 500):
+            data = make_post_list(page_size)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{page_size} posts'))
+            if JSONRenderer().render(data) != FastJSONRenderer().render(data):
+                self.stderr.write(self.style.ERROR('  rendered bodies differ'))
+
+            for renderer in (JSONRenderer(), FastJSONRenderer()):
+                start = time.perf_counter()
+                for _ in range(options['repeat']):
+                    renderer.render(data)
+                elapsed = (time.perf_counter() - start) / options['repeat'] * 1000
+                self.stdout.write(f'  {type(renderer).__name__:<18} {elapsed:8.3f} ms')
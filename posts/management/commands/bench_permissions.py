@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.management.seed import seed_posts
+from posts.models import Post
+from posts.permissions import (
+    PERMISSION_VALUES, PERMISSION_VALUE_FIELDS,
+    get_user_permission_level, get_permission_level_from_values, get_permission_levels,
+)
+
+
+def legacy_user_permission_level(user, post):
+    """The object based check used before posts were compared by ids."""
+    if user.is_authenticated and (user.is_superuser or getattr(user, 'role', None) == 'admin'):
+        return 'write'
+    if post.author == user:
+        return post.author_access
+    if not user.is_authenticated:
+        return post.public_access
+    permissions = [post.public_access, post.authenticated_access]
+    if user.team and user.team == post.author.team:
+        permissions.append(post.team_access)
+    return max(permissions, key=lambda x: PERMISSION_VALUES[x])
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway post corpus and compare the per-post cost of the permission check: '
+        'related-object comparisons, id comparisons on model instances, on values_list() rows '
+        'and the batch variant. All seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            authors = seed_posts(options['rows'])
+            self.run(authors[0])
+            transaction.set_rollback(True)
+
+    def run(self, user):
+        # includes the query that loads the posts
+        cases = {
+            'legacy (related objects)': lambda: [
+                legacy_user_permission_level(user, post) for post in Post.objects.all()
+            ],
+            'get_user_permission_level': lambda: [
+                get_user_permission_level(user, post) for post in Post.objects.all()
+            ],
+            'from values_list rows': lambda: [
+                get_permission_level_from_values(user, *row)
+                for row in Post.objects.values_list(*PERMISSION_VALUE_FIELDS)
+            ],
+            'get_permission_levels': lambda: get_permission_levels(
+                user, Post.objects.values_list(*PERMISSION_VALUE_FIELDS)
+            ),
+        }
+        count = Post.objects.count()
+        results = {}
+        for label, check in cases.items():
+            start = time.perf_counter()
+            results[label] = check()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'{label:<28} {elapsed / count * 1e6:8.2f} us per post')
+
+        if len({tuple(levels) for levels in results.values()}) != 1:
+            self.stderr.write(self.style.ERROR('permission levels differ'))
@@ -0,0 +1,59 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from posts import search
+from posts.management.seed import seed_posts
+from posts.models import Post
+from posts.permissions import get_readable_posts_query
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway post corpus, index it and compare the first result page of '
+        'the full-text search with icontains over title and body for rare and common words. '
+        'All seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            self.stderr.write(self.style.WARNING('This database has no search index, both sides use icontains'))
+
+        with transaction.atomic():
+            seed_posts(options['rows'])
+            search.rebuild()
+            self.run(options['rows'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def run(self, rows, repeat):
+        # seeded titles are 'Benchmark post <n>', bodies repeat 'lorem ipsum dolor sit amet'
+        readable = Post.objects.filter(get_readable_posts_query(AnonymousUser()))
+        terms = {
+            'rare': readable.order_by('id').values_list('title', flat=True)[rows // 8],
+            'common': 'lorem',
+            'two words': 'dolor amet',
+        }
+        for label, q in terms.items():
+            icontains = readable
+            for term in search.get_terms(q):
+                icontains = icontains.filter(Q(title__icontains=term) | Q(body__content__icontains=term))
+            cases = [
+                ('icontains', icontains.order_by('-created_at', '-id')),
+                ('full-text', search.search_posts(readable, q).order_by('-rank', '-id')),
+            ]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{label}: {q!r}'))
+            for name, queryset in cases:
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    count = queryset.count()
+                    list(queryset.values_list('id', flat=True)[:10])
+                elapsed = (time.perf_counter() - start) / repeat * 1000
+                self.stdout.write(f'  {name:<10} {elapsed:9.2f} ms per page  ({count} matches)')
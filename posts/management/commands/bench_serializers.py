@@ -0,0 +1,64 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog_app_back.compiled_serializers import CompiledSerializer
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from likes.models import Like
+from likes.serializers import LikeSerializer
+from posts.management.seed import seed_posts
+from posts.models import Post
+from posts.serializers import PostSerializer
+from posts.views import PostListCreateView, annotate_viewer_state
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed throwaway posts, comments and likes and compare serialized rows per second '
+        'of the DRF serializers and their compiled .values() counterparts. '
+        'All seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            authors = seed_posts(options['rows'], users=50)
+            posts = list(Post.objects.values_list('id', flat=True))
+            rng = random.Random(0)
+            Comment.objects.bulk_create([
+                Comment(user=rng.choice(authors), post_id=rng.choice(posts), content=f'Benchmark comment {i}')
+                for i in range(options['rows'])
+            ])
+            Like.objects.bulk_create([
+                Like(user=rng.choice(authors), post_id=post_id) for post_id in posts
+            ])
+            self.run(authors[0])
+            transaction.set_rollback(True)
+
+    def run(self, viewer):
+        posts = annotate_viewer_state(Post.objects.select_related('author__team', 'body'), viewer)
+        cases = [
+            ('PostSerializer', PostSerializer, posts,
+             {'paths': PostListCreateView.compiled_paths, 'annotations': PostListCreateView.compiled_annotations}),
+            ('CommentSerializer', CommentSerializer, Comment.objects.select_related('user', 'post'), {}),
+            ('LikeSerializer', LikeSerializer, Like.objects.select_related('user'), {}),
+        ]
+        for label, serializer_class, queryset, options in cases:
+            compiled = CompiledSerializer(serializer_class(), **options)
+            instances = list(queryset)
+            rows = list(queryset.values(*compiled.paths))
+
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            for name, render, items in (
+                ('serializer', lambda items: serializer_class(items, many=True).data, instances),
+                ('compiled', compiled.render_many, rows),
+            ):
+                start = time.perf_counter()
+                render(items)
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f'  {name:<10} {len(items) / elapsed:12,.0f} rows/s')
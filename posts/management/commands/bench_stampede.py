@@ -0,0 +1,82 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from posts import cache
+from posts.models import Post
+from posts.views import PostDetailView
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Reproduce a cache stampede on an anonymous post detail: invalidate the post, '
+        'then fire concurrent requests with and without single flight and report how many '
+        'recomputed the response. A throwaway post is created and deleted again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--rounds', type=int, default=5)
+        parser.add_argument('--delay', type=float, default=0.05,
+                            help='Seconds added to each recomputation, standing in for a slow database')
+
+    def handle(self, *args, **options):
+        author = User.objects.create_user(email='stampede@example.com', username='stampede')
+        post = Post.objects.create(
+            author=author, title='Viral post', content='<p>' + 'Everyone is reading this. ' * 200 + '</p>',
+            team_access='read', authenticated_access='read', public_access='read',
+        )
+        try:
+            for single_flight in (False, True):
+                self.run(post, single_flight, options)
+        finally:
+            author.delete()
+
+    def run(self, post, single_flight, options):
+        delay = options['delay']
+
+        class View(PostDetailView):
+            use_single_flight = single_flight
+
+            def get_object(self):
+                time.sleep(delay)
+                return super().get_object()
+
+        view = View.as_view()
+        # responses are cached per host, and the factory's 'testserver' isn't allowed
+        factory = APIRequestFactory(SERVER_NAME=settings.ALLOWED_HOSTS[0])
+        concurrency = options['concurrency']
+
+        def fetch(barrier):
+            barrier.wait()
+            start = time.perf_counter()
+            try:
+                response = view(factory.get(f'/api/post/{post.pk}/'), pk=post.pk)
+                return response['X-Cache'], time.perf_counter() - start
+            finally:
+                connection.close()
+
+        recomputed, statuses, latencies = [], {}, []
+        for _ in range(options['rounds']):
+            cache.invalidate_post(post.pk)
+            misses = cache.get_stats()['misses']
+            barrier = threading.Barrier(concurrency)
+            with ThreadPoolExecutor(concurrency) as pool:
+                results = list(pool.map(lambda _: fetch(barrier), range(concurrency)))
+            recomputed.append(cache.get_stats()['misses'] - misses)
+            for status, elapsed in results:
+                statuses[status] = statuses.get(status, 0) + 1
+                latencies.append(elapsed * 1000)
+
+        label = 'single flight' if single_flight else 'no coalescing'
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        self.stdout.write(f'  recomputations per stampede: {statistics.mean(recomputed):.1f} of {concurrency} requests')
+        self.stdout.write(f"  responses: {', '.join(f'{status} {count}' for status, count in sorted(statuses.items()))}")
+        self.stdout.write(f'  latency ms: p50 {statistics.median(latencies):.1f}, max {max(latencies):.1f}')
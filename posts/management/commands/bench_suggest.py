@@ -0,0 +1,71 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from posts import search, suggest
+from posts.management.seed import seed_posts
+from posts.views import PostSuggestView
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'sto', 'va', 'dir', 'pe', 'qua', 'tin', 'bel', 'gor', 'nu', 'shi', 'ex']
+
+
+def make_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway corpus with varied titles and measure /api/post/suggest/ latency for '
+        'typed prefixes, with cold and warm in-process suggestion caches. Fails when the warm p99 '
+        'is above --target-ms. All seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--target-ms', type=float, default=20.0, help='p99 latency budget with the cache warm')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            seed_posts(options['rows'], make_title=lambda rng, i: ' '.join(make_word(rng) for _ in range(rng.randint(2, 5))).capitalize())
+            search.rebuild()
+            p99 = self.run(options['requests'])
+            transaction.set_rollback(True)
+
+        if p99 > options['target_ms']:
+            raise CommandError(f'p99 {p99:.2f} ms is above the {options["target_ms"]} ms target')
+        self.stdout.write(self.style.SUCCESS(f'p99 {p99:.2f} ms is within the {options["target_ms"]} ms target'))
+
+    def run(self, count):
+        # users type the first letters of popular words: a skewed mix of 1-5 character prefixes
+        rng = random.Random(1)
+        words = [make_word(rng) for _ in range(200)]
+        weights = [1 / rank for rank in range(1, len(words) + 1)]
+        typed = []
+        for word in rng.choices(words, weights, k=count):
+            typed.append(word[:rng.randint(1, 5)])
+
+        view = PostSuggestView.as_view()
+        factory = APIRequestFactory()
+        warm = None
+        for label, clear in (('cold, no in-process cache', True), ('warm, in-process cache', False)):
+            suggest.suggestions.clear()
+            latencies = []
+            for q in typed:
+                if clear:
+                    suggest.suggestions.clear()
+                start = time.perf_counter()
+                response = view(factory.get('/api/post/suggest/', {'q': q}))
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.data
+
+            cuts = statistics.quantiles(latencies, n=100)
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(f'  latency ms: p50 {cuts[49]:.2f}, p95 {cuts[94]:.2f}, p99 {cuts[98]:.2f}, max {max(latencies):.2f}')
+            warm = cuts[98]
+        self.stdout.write(f'  distinct prefixes: {len(set(typed))} of {count} requests')
+        return warm
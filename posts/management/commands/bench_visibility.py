@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from posts.management.seed import seed_posts
+from posts.models import Post
+from posts.permissions import get_readable_posts_query
+
+
+def legacy_readable_posts_query(user):
+    """The four-clause OR filter used before Post.read_tier existed."""
+    query = Q(public_access__in=['read', 'write'])
+    if user.is_authenticated:
+        query |= Q(authenticated_access__in=['read', 'write'])
+        query |= Q(team_access__in=['read', 'write'], author__team=user.team)
+        query |= Q(author_access__in=['read', 'write'], author=user)
+    return query
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway post corpus and compare the query plan and latency of '
+        'the post list visibility filter for anonymous, authenticated and team users. '
+        'All seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            authors = seed_posts(options['rows'])
+            self.run(authors, options['repeat'])
+            transaction.set_rollback(True)
+
+    def run(self, authors, repeat):
+        viewers = {
+            'anonymous': AnonymousUser(),
+            # saved (and rolled back with the corpus): related filters need a primary key
+            'authenticated': get_user_model().objects.create_user(
+                email='bench-viewer@example.com', username='bench-viewer',
+            ),
+            'same-team': authors[0],
+        }
+        for label, user in viewers.items():
+            for name, build in (('legacy', legacy_readable_posts_query), ('read_tier', get_readable_posts_query)):
+                queryset = Post.objects.filter(build(user)).order_by('-created_at', '-id')[:11]
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{label} / {name}'))
+                self.stdout.write(queryset.explain())
+
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    list(queryset.values_list('id', flat=True))
+                elapsed = (time.perf_counter() - start) / repeat * 1000
+                self.stdout.write(f'  {elapsed:.2f} ms per page\n')
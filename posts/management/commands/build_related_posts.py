@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import related
+
+
+class Command(BaseCommand):
+    help = (
+        'Compute related posts (TF-IDF similarity of title and excerpt) for the posts saved since '
+        'their last build and the lists those changes affect. Needs numpy and scipy.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every list, e.g. periodically or after bulk imports')
+        parser.add_argument('--count', type=int, default=related.RELATED_COUNT, help='Related posts stored per post')
+        parser.add_argument('--batch-size', type=int, default=related.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if not related.is_available():
+            raise CommandError('numpy and scipy are required: pip install numpy scipy')
+
+        start = time.perf_counter()
+        recomputed, total = related.refresh(full=options['full'], count=options['count'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f'Recomputed related posts of {recomputed} of {total} posts in {elapsed:.1f} s'))
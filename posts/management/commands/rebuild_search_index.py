@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts import search
+
+
+class Command(BaseCommand):
+    help = 'Reindex every post for full-text search, e.g. after posts were bulk inserted without save().'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if not search.is_supported(options['database']):
+            self.stderr.write(self.style.WARNING('This database has no search index, search falls back to icontains'))
+            return
+        count = search.rebuild(options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} posts'))
@@ -0,0 +1,63 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from posts.models import Post, PostBody
+from posts.permissions import get_read_tier
+from users.models import Team
+
+ACCESS_PROFILES = [
+    # (team_access, authenticated_access, public_access)
+    ('read', 'read', 'read'),
+    ('write', 'read', 'none'),
+    ('read', 'none', 'none'),
+    ('none', 'none', 'none'),
+]
+
+
+def seed_posts(rows, teams=10, users=200, batch_size=2000, seed=0, make_title=None):
+    """
+    Bulk insert a synthetic corpus for benchmarks: `teams` teams, `users`
+    authors spread across them and `rows` posts with a mix of access profiles.
+    make_title(rng, i): title of the i-th post, 'Benchmark post <i>' by default.
+    Returns the list of created users.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+
+    team_objs = Team.objects.bulk_create(
+        [Team(name=f'bench-team-{seed}-{i}') for i in range(teams)]
+    )
+    password = make_password(None)
+    authors = User.objects.bulk_create([
+        User(
+            email=f'bench-{seed}-{i}@example.com',
+            username=f'bench-{seed}-{i}',
+            password=password,
+            team=team_objs[i % teams],
+        )
+        for i in range(users)
+    ])
+
+    for start in range(0, rows, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, rows)):
+            team_access, authenticated_access, public_access = rng.choice(ACCESS_PROFILES)
+            content = f'Benchmark post {i} ' + 'lorem ipsum dolor sit amet ' * rng.randint(5, 60)
+            author = rng.choice(authors)
+            batch.append(Post(
+                author=author,
+                author_team_id=author.team_id,
+                title=make_title(rng, i) if make_title else f'Benchmark post {i}',
+                content=content,
+                excerpt=content[:200],
+                team_access=team_access,
+                authenticated_access=authenticated_access,
+                public_access=public_access,
+                read_tier=get_read_tier(team_access, authenticated_access, public_access),
+            ))
+        Post.objects.bulk_create(batch)
+        PostBody.objects.bulk_create([PostBody(post=post, content=post.content) for post in batch])
+
+    return authors
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+READABLE = ['read', 'write']
+
+
+def backfill_read_tier(apps, schema_editor):
+    # One UPDATE per tier instead of saving every row
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.filter(public_access__in=READABLE).update(read_tier=3)
+    Post.objects.exclude(public_access__in=READABLE).filter(authenticated_access__in=READABLE).update(read_tier=2)
+    Post.objects.exclude(public_access__in=READABLE).exclude(authenticated_access__in=READABLE).filter(
+        team_access__in=READABLE
+    ).update(read_tier=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='read_tier',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_read_tier, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('read_tier', 3)), fields=['-created_at', '-id'], name='post_public_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('read_tier__gte', 2)), fields=['-created_at', '-id'], name='post_auth_created_idx'),
+        ),
+    ]
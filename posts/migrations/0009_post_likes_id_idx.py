@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 10000
+
+
+def backfill_likes_count(apps, schema_editor):
+    # likes_count was never maintained before, recount it from likes_like in id-range
+    # batches; the migration isn't atomic, so each batch commits on its own
+    Post = apps.get_model('posts', 'Post')
+    Like = apps.get_model('likes', 'Like')
+    like_count = Like.objects.filter(post_id=OuterRef('pk')).order_by().values('post_id').annotate(
+        total=Count('id')
+    ).values('total')
+
+    last_id = Post.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        Post.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE).update(
+            likes_count=Coalesce(Subquery(like_count), 0)
+        )
+
+
+class Migration(migrations.Migration):
+    # a recount is idempotent, so a run interrupted between batches can be rerun
+    atomic = False
+
+    dependencies = [
+        ('posts', '0008_post_author_team'),
+        ('likes', '0004_alter_like_options_alter_like_unique_together_and_more'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-likes_count', '-id'], name='post_likes_id_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def copy_content_to_body(apps, schema_editor):
+    # Walk posts by id in batches so large tables are never loaded at once
+    Post = apps.get_model('posts', 'Post')
+    PostBody = apps.get_model('posts', 'PostBody')
+
+    last_id = 0
+    while True:
+        batch = list(
+            Post.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'content')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        PostBody.objects.bulk_create([PostBody(post_id=pk, content=content) for pk, content in batch])
+        last_id = batch[-1][0]
+
+
+def copy_body_to_content(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostBody = apps.get_model('posts', 'PostBody')
+
+    last_id = 0
+    while True:
+        batch = list(
+            PostBody.objects.filter(post_id__gt=last_id).order_by('post_id').values_list('post_id', 'content')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        Post.objects.bulk_update([Post(id=pk, content=content) for pk, content in batch], ['content'])
+        last_id = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_likes_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostBody',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='posts.post')),
+                ('content', models.TextField()),
+            ],
+        ),
+        migrations.RunPython(copy_content_to_body, copy_body_to_content),
+        # Lets the column be re-added on existing rows when unapplying
+        migrations.AlterField(
+            model_name='post',
+            name='content',
+            field=models.TextField(default=''),
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='content',
+        ),
+    ]
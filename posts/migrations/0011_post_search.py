@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-18 00:10
+
+from django.db import migrations
+
+from posts import search
+
+
+def create_search_index(apps, schema_editor):
+    # tsvector + GIN on PostgreSQL, FTS5 on SQLite, nothing elsewhere (see posts.search)
+    search.create_index(schema_editor)
+    search.rebuild(schema_editor.connection.alias, post_model=apps.get_model('posts', 'Post'))
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_postbody'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:30
+
+from django.db import migrations
+
+from posts import suggest
+
+
+def create_title_indexes(apps, schema_editor):
+    # lower(title) prefix index everywhere, plus pg_trgm GIN on PostgreSQL (see posts.suggest)
+    suggest.create_indexes(schema_editor)
+
+
+def drop_title_indexes(apps, schema_editor):
+    suggest.drop_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_indexes, drop_title_indexes),
+    ]
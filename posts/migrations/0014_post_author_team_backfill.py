@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 23:12
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 10000
+
+
+def backfill_author_team(apps, schema_editor):
+    # Correlated UPDATE per id range; the migration isn't atomic, so each batch
+    # commits on its own and no transaction holds locks on the whole table
+    Post = apps.get_model('posts', 'Post')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    team_of_author = User.objects.filter(pk=OuterRef('author_id')).values('team_id')[:1]
+
+    last_id = Post.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        Post.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE).update(
+            author_team_id=Subquery(team_of_author)
+        )
+
+
+class Migration(migrations.Migration):
+    # Moved out of 0008: on PostgreSQL the UPDATEs queue deferred foreign key
+    # checks, and the CREATE INDEX after them failed on a table with pending
+    # trigger events. Idempotent, so databases that ran the old 0008 can rerun it,
+    # and so can a run interrupted between batches.
+    atomic = False
+
+    dependencies = [
+        ('posts', '0013_related_posts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_author_team, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:40
+
+from django.db import migrations
+
+from posts import search
+
+
+def drop_post_foreign_key(apps, schema_editor):
+    # rows are removed by the post_delete receiver instead (see posts.search.remove_post)
+    search.drop_post_foreign_key(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_post_author_team_backfill'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_post_foreign_key, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.conf import settings
-from django.utils.html import strip_tags
+from . import search
+from .utils import build_excerpt
+from .permissions import get_read_tier, READ_TIER_AUTHOR, READ_TIER_AUTHENTICATED, READ_TIER_PUBLIC
 
 User = settings.AUTH_USER_MODEL
 
@@ -21,8 +23,14 @@ class Post(models.Model):
     ]
 
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
+    # Copy of author.team, kept in sync by posts.signals so team-scoped reads
+    # and permission checks never need the users_user row
+    author_team = models.ForeignKey(
+        'users.Team', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+', editable=False, db_index=False
+    )
     title = models.CharField(max_length=200)
-    content = models.TextField()
+    # `content` is a property backed by PostBody, see below
     excerpt = models.TextField(max_length=200, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add= True)
     update_at = models.DateTimeField(auto_now= True)
@@ -48,20 +56,166 @@ class Post(models.Model):
         default='write'
     )
 
+    # Derived from the access columns on save, see posts.permissions.get_read_tier
+    read_tier = models.PositiveSmallIntegerField(default=READ_TIER_AUTHOR, editable=False)
+
+    @property
+    def content(self):
+        """
+        Post body. It lives in PostBody so list/count/permission scans of
+        posts_post never read it; it is loaded on first access (or up front
+        with select_related('body')).
+        """
+        if '_content' not in self.__dict__:
+            body = self._get_body()
+            self.__dict__['_content'] = body.content if body is not None else ''
+        return self.__dict__['_content']
+
+    @content.setter
+    def content(self, value):
+        self.__dict__['_content'] = value
+        self._content_changed = True
+
+    def _get_body(self):
+        if self.pk is None:
+            return None
+        try:
+            return self.body
+        except PostBody.DoesNotExist:
+            return None
+
     def save(self, *args, **kwargs):
-        # Always regenerate excerpt from current content (strip HTML safely without external deps)
-        text = strip_tags(self.content or '')
-        text = ' '.join(text.split())  # normalize whitespace
-        if len(text) > 200:
-            cut = text[:200]
-            cut = cut.rsplit(' ', 1)[0] if ' ' in cut else cut
-            self.excerpt = f"{cut}..."
-        else:
-            self.excerpt = text
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        write_body = adding or getattr(self, '_content_changed', False)
+        if kwargs.get('update_fields') is not None:
+            write_body = 'content' in kwargs['update_fields']
+            kwargs['update_fields'] = self._get_update_fields(kwargs['update_fields'], write_body)
+
+        # Regenerate excerpt whenever content is new or changed (only parses as much HTML as the excerpt needs)
+        if write_body:
+            self.excerpt = build_excerpt(self.content)
+        self.read_tier = get_read_tier(self.team_access, self.authenticated_access, self.public_access)
+        self.author_team_id = self._get_author_team_id()
+
+        # the search index follows the title and body, see posts.search
+        reindex = write_body or (
+            self.title != getattr(self, '_stored_title', None)
+            and (kwargs.get('update_fields') is None or 'title' in kwargs['update_fields'])
+        )
+        if not reindex:
+            super().save(*args, **kwargs)
+            return
+
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            if write_body:
+                self._save_body(adding)
+            search.index_post(self, content_changed=write_body, using=using)
+        self._stored_title = self.title
+
+    def _get_update_fields(self, update_fields, content_changed):
+        """
+        Columns to write for save(update_fields=...): the given ones plus
+        those derived from them. `content` is written to PostBody instead.
+        """
+        update_fields = set(update_fields) - {'content'}
+        if content_changed:
+            update_fields.add('excerpt')
+        if update_fields & {'team_access', 'authenticated_access', 'public_access'}:
+            update_fields.add('read_tier')
+        if 'author' in update_fields:
+            update_fields.add('author_team')
+        if update_fields:
+            update_fields.add('update_at')
+        return update_fields
+
+    def _save_body(self, adding):
+        content = self.content
+        if adding or not PostBody.objects.filter(post_id=self.pk).update(content=content):
+            self.body = PostBody.objects.create(post=self, content=content)
+        elif self._meta.get_field('body').is_cached(self):
+            self.body.content = content
+        self._content_changed = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # visibility as stored, so posts.signals can tell whether a save hid a public post
+        instance._stored_read_tier = instance.__dict__.get('read_tier')
+        # title as stored, so save() only reindexes it when it changed
+        instance._stored_title = instance.__dict__.get('title')
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        if fields is None:
+            self.__dict__.pop('_content', None)
+            self._content_changed = False
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+    def _get_author_team_id(self):
+        author_field = self._meta.get_field('author')
+        if author_field.is_cached(self):
+            return self.author.team_id
+        if self._state.adding and self.author_id is not None:
+            return author_field.related_model.objects.filter(pk=self.author_id).values_list('team_id', flat=True).first()
+        return self.author_team_id
 
     def __str__(self):
         return f"{self.title} ({self.author})"
     
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination walks (created_at, id) in descending order
+            models.Index(fields=['-created_at', '-id'], name='post_created_id_idx'),
+            models.Index(fields=['author_team', '-created_at'], name='post_team_created_idx'),
+            models.Index(fields=['-likes_count', '-id'], name='post_likes_id_idx'),
+            # One partial index per shared access tier, so anonymous and
+            # authenticated listings are index scans over just the visible rows
+            models.Index(
+                fields=['-created_at', '-id'], name='post_public_created_idx',
+                condition=models.Q(read_tier=READ_TIER_PUBLIC),
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], name='post_auth_created_idx',
+                condition=models.Q(read_tier__gte=READ_TIER_AUTHENTICATED),
+            ),
+        ]
+
+
+class PostBody(models.Model):
+    """
+    Post content, kept out of posts_post so its rows stay narrow
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='body')
+    content = models.TextField()
+
+    def __str__(self):
+        return f"Body of post {self.post_id}"
+
+
+class RelatedPost(models.Model):
+    """
+    Precomputed related posts: the nearest neighbours of `post` by TF-IDF
+    similarity of title and excerpt, rank 0 first. Written by posts.related.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='related_from')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ('post', 'rank')
+
+    def __str__(self):
+        return f"Post {self.related_id} related to post {self.post_id} ({self.score:.2f})"
+
+
+class RelatedPostsBuild(models.Model):
+    """
+    When the related posts of `post` were last computed, so refreshes only
+    redo posts saved since
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='related_build')
+    built_at = models.DateTimeField()
@@ -1,5 +1,12 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 import math
 
 class PostPagination(PageNumberPagination):
@@ -16,4 +23,151 @@ class PostPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
 
-        })
\ No newline at end of file
+        })
+
+
+class PostCursorPagination(BasePagination):
+    """
+    Keyset pagination over (ordering field, id).
+
+    Each page is fetched with a `WHERE (field, id) < (last_field, last_id)` style
+    filter instead of OFFSET, and no COUNT(*) is issued, so the cost of a page
+    does not grow with its depth and rows inserted while a client scrolls never
+    shift the following pages.
+    """
+    page_size = 10
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    # Primary sort field; `id` is always appended as the tiebreaker.
+    ordering = '-created_at'
+
+    def get_ordering(self, view):
+        """Return the (primary, tiebreaker) ordering for the current request."""
+        ordering = view.get_ordering() if hasattr(view, 'get_ordering') else self.ordering
+        descending = ordering.startswith('-')
+        return ordering, '-id' if descending else 'id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.keys = self.get_ordering(view)
+        self.field = self.keys[0].lstrip('-')
+        self.descending = self.keys[0].startswith('-')
+
+        cursor = self.decode_cursor(request, queryset.model)
+        if cursor is None:
+            reverse = False
+            queryset = queryset.order_by(*self.keys)
+        else:
+            position, pk, reverse = cursor
+            # Walking backwards flips both the comparison and the sort direction.
+            forward = self.descending != reverse
+            lookup = 'lt' if forward else 'gt'
+            # The OR alone is not an index range; the redundant inclusive bound
+            # lets the (field, id) index start at the cursor instead of the first row.
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}e': position}),
+                Q(**{f'{self.field}__{lookup}': position}) |
+                Q(**{self.field: position, f'id__{lookup}': pk})
+            )
+            if reverse:
+                queryset = queryset.order_by(*[self._flip(field) for field in self.keys])
+            else:
+                queryset = queryset.order_by(*self.keys)
+
+        # Fetch one extra row to know whether there is a following page.
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = cursor is not None
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Opaque cursor returned in the `next`/`previous` links.',
+            'schema': {'type': 'string'},
+        }]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Nothing left in this direction; step back to the first page.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, item, reverse):
+        position = self._get_value(item, self.field)
+        tokens = {
+            'p': position.isoformat() if hasattr(position, 'isoformat') else str(position),
+            'i': str(self._get_value(item, 'id')),
+        }
+        if reverse:
+            tokens['r'] = '1'
+        encoded = b64encode(parse.urlencode(tokens).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            position = model._meta.get_field(self.field).to_python(tokens['p'][0])
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, IndexError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if position is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, pk, reverse
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _get_value(item, name):
+        # pages are model instances, or .values() rows on the compiled path
+        if isinstance(item, dict):
+            return item[name]
+        return getattr(item, name)
@@ -1,7 +1,28 @@
-from django.db.models import Q
+from operator import attrgetter
+
+from django.db.models import Case, CharField, F, Q, Value, When
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import BasePermission
 
 PERMISSION_VALUES = {'none': 0, 'read': 1, 'write': 2}
 
+READABLE_LEVELS = ['read', 'write']
+
+# Post columns get_user_permission_level reads
+PERMISSION_FIELDS = ['author', 'author_team', 'author_access', 'team_access', 'authenticated_access', 'public_access']
+
+# Same columns in the order get_permission_level_from_values / get_permission_levels
+# take them, e.g. Post.objects.values_list(*PERMISSION_VALUE_FIELDS)
+PERMISSION_VALUE_FIELDS = ['author_id', 'author_team_id', 'author_access', 'team_access', 'authenticated_access', 'public_access']
+
+# Widest audience that can read a post, packed into Post.read_tier so that
+# visibility filters are a single indexed integer comparison.
+READ_TIER_AUTHOR = 0
+READ_TIER_TEAM = 1
+READ_TIER_AUTHENTICATED = 2
+READ_TIER_PUBLIC = 3
+
 def validate_permission_hierarchy_values(author_access, team_access, authenticated_access, public_access):
     errors = {}
 
@@ -21,29 +42,116 @@ def validate_permission_hierarchy_values(author_access, team_access, authenticat
 
     return errors
 
+def get_read_tier(team_access, authenticated_access, public_access):
+    """
+    return the widest audience allowed to read a post as a READ_TIER_* value
+    """
+    if public_access in READABLE_LEVELS:
+        return READ_TIER_PUBLIC
+    if authenticated_access in READABLE_LEVELS:
+        return READ_TIER_AUTHENTICATED
+    if team_access in READABLE_LEVELS:
+        return READ_TIER_TEAM
+    return READ_TIER_AUTHOR
+
 def get_user_permission_level(user, post):
     """
     return the highest access level from user in a post
     return: 'none', 'read', 'write'
     """
-    if user.is_authenticated and (user.is_superuser or getattr(user, 'role', None) == 'admin'):
+    return get_permission_level_from_values(
+        user, post.author_id, post.author_team_id,
+        post.author_access, post.team_access, post.authenticated_access, post.public_access,
+    )
+
+def _is_admin(user):
+    return user.is_authenticated and (user.is_superuser or getattr(user, 'role', None) == 'admin')
+
+class IsAdmin(BasePermission):
+    """Superusers and users with the admin role"""
+
+    def has_permission(self, request, view):
+        return _is_admin(request.user)
+
+def get_permission_level_from_values(user, author_id, author_team_id, author_access, team_access, authenticated_access, public_access):
+    """
+    get_user_permission_level on plain column values, e.g. a row of
+    Post.objects.values_list(*PERMISSION_VALUE_FIELDS). Only ids are compared
+    so no related object is ever loaded
+    """
+    if _is_admin(user):
         return 'write'
-    
-    if post.author == user:
-        return post.author_access
-    
+
+    if author_id == user.pk:
+        return author_access
+
     if not user.is_authenticated:
-        return post.public_access
-    
-    permissions = [post.public_access, post.authenticated_access]
+        return public_access
 
-    if getattr(user, 'team', None) and getattr(post.author, 'team', None):
-        if user.team == post.author.team:
-            permissions.append(post.team_access)
+    permissions = [public_access, authenticated_access]
 
+    # post.author_team mirrors the author's team
+    team_id = getattr(user, 'team_id', None)
+    if team_id is not None and author_team_id == team_id:
+        permissions.append(team_access)
 
     return max(permissions, key=lambda x: PERMISSION_VALUES[x])
 
+def get_permission_levels(user, rows):
+    """
+    Batch version of get_permission_level_from_values: the levels of one user
+    for many posts given as PERMISSION_VALUE_FIELDS rows, in the same order.
+    Everything about the user is worked out once, not per row
+    """
+    rows = list(rows)
+    if _is_admin(user):
+        return ['write'] * len(rows)
+
+    if not user.is_authenticated:
+        return [row[5] for row in rows]
+
+    user_id = user.pk
+    team_id = getattr(user, 'team_id', None)
+    rank = PERMISSION_VALUES
+
+    levels = []
+    for author_id, author_team_id, author_access, team_access, authenticated_access, public_access in rows:
+        if author_id == user_id:
+            levels.append(author_access)
+            continue
+
+        level = authenticated_access if rank[authenticated_access] > rank[public_access] else public_access
+        if team_id is not None and author_team_id == team_id and rank[team_access] > rank[level]:
+            level = team_access
+        levels.append(level)
+    return levels
+
+def get_permission_level_expression(user):
+    """
+    SQL expression equivalent to get_user_permission_level, to annotate post querysets
+    return: expression evaluating to 'none', 'read' or 'write'
+    """
+    if user.is_authenticated and (user.is_superuser or getattr(user, 'role', None) == 'admin'):
+        return Value('write', output_field=CharField())
+
+    if not user.is_authenticated:
+        return F('public_access')
+
+    # highest of public, authenticated and (same team only) team access
+    write = Q(public_access='write') | Q(authenticated_access='write')
+    read = Q(public_access='read') | Q(authenticated_access='read')
+    if user.team_id is not None:
+        write |= Q(author_team_id=user.team_id, team_access='write')
+        read |= Q(author_team_id=user.team_id, team_access='read')
+
+    return Case(
+        When(author_id=user.pk, then=F('author_access')),
+        When(write, then=Value('write')),
+        When(read, then=Value('read')),
+        default=Value('none'),
+        output_field=CharField(),
+    )
+
 def user_can_read_post(user, post):
     """
     check if user can read a post
@@ -56,6 +164,23 @@ def user_can_edit_post(user, post):
     """
     return get_user_permission_level(user, post) == 'write'
 
+def get_readable_object_or_404(user, queryset, post_path=None, **lookup):
+    """
+    Fetch an object together with the post it belongs to (`post_path`, e.g.
+    'post' for a comment; None when the object is the post) in one query and
+    check the user can read that post. The check only compares ids already on
+    the row, so nothing is lazily loaded.
+    Raises Http404 if the object doesn't exist and NotFound if the post isn't readable
+    """
+    if post_path:
+        queryset = queryset.select_related(post_path)
+    obj = get_object_or_404(queryset, **lookup)
+
+    post = attrgetter(post_path.replace('__', '.'))(obj) if post_path else obj
+    if not user_can_read_post(user, post):
+        raise NotFound("Post Not Found")
+    return obj
+
 def get_readable_posts_query(user):
     """
     Generate Q object for filtering readable posts based on user permissions.
@@ -66,12 +191,14 @@ def get_readable_posts_query(user):
         return Q()  # Empty Q()- all posts
     
     # Start with public posts (everyone can see these)
-    query = Q(public_access__in = ['read', 'write'])
-    
-    # If user is authenticated, add more permissions
-    if user.is_authenticated:
-        query |= Q(authenticated_access__in=['read', 'write'])
-        query |= Q(team_access__in=['read', 'write'], author__team=user.team)
-        query |= Q(author_access__in=['read', 'write'], author=user)
-    
+    if not user.is_authenticated:
+        return Q(read_tier=READ_TIER_PUBLIC)
+
+    # Authenticated users see public and authenticated posts, team posts of
+    # their own team and their own posts
+    query = Q(read_tier__gte=READ_TIER_AUTHENTICATED)
+    if user.team_id is not None:
+        query |= Q(read_tier=READ_TIER_TEAM, author_team_id=user.team_id)
+    query |= Q(author_access__in=READABLE_LEVELS, author_id=user.pk)
+
     return query
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Related posts: nearest neighbours by TF-IDF cosine similarity of title and
+excerpt.
+
+`manage.py build_related_posts` computes them with NumPy and SciPy sparse
+matrices (optional dependencies, only the command needs them) and stores
+the best RELATED_COUNT of each post in RelatedPost; the API only reads that
+table and filters it by what the viewer can read.
+
+Refreshes are incremental: lists are recomputed for posts saved since their
+last build (RelatedPostsBuild) and for the posts whose lists those changes
+can enter or leave. Vectors always come from the whole corpus, but lists
+that are not recomputed keep scores from older IDF weights, and lists that
+lost a deleted post stay short, until the next --full build.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .search import WORD_RE
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional, see is_available()
+    np = sparse = None
+
+RELATED_COUNT = 20
+# below this, two posts only share a word or two
+MIN_SCORE = 0.05
+# a title word counts as much as this many excerpt words
+TITLE_WEIGHT = 2
+# words in more than this share of the posts say nothing about relatedness
+MAX_DOCUMENT_FREQUENCY = 0.5
+# Similarities are sparse: a pair only has an entry when the posts share a
+# word. A batch holds at most BATCH_SIZE posts, and at most MAX_BATCH_ENTRIES
+# entries by an upper bound computed before multiplying (about 8 bytes each),
+# so memory stays bounded by MAX_BATCH_ENTRIES (or one post's row) whatever
+# the corpus size.
+BATCH_SIZE = 1000
+MAX_BATCH_ENTRIES = 20_000_000
+
+
+def is_available():
+    return np is not None
+
+
+def get_term_counts(title, excerpt):
+    counts = Counter(WORD_RE.findall((excerpt or '').lower()))
+    for term in WORD_RE.findall(title.lower()):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+def build_vectors(documents):
+    """
+    documents: list of (title, excerpt)
+    return: CSR matrix with one L2 normalized TF-IDF row per document
+    """
+    vocabulary = {}
+    indptr, indices, counts = [0], [], []
+    for title, excerpt in documents:
+        for term, count in get_term_counts(title, excerpt).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+
+    size = len(documents)
+    tf = sparse.csr_matrix(
+        (np.array(counts, dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(size, len(vocabulary)),
+    )
+    df = np.bincount(tf.indices, minlength=len(vocabulary))
+    # a word of a single post can't relate two posts
+    terms = np.flatnonzero((df >= 2) & (df <= MAX_DOCUMENT_FREQUENCY * size))
+    tf = tf[:, terms]
+    tf.data = 1 + np.log(tf.data)
+    idf = (np.log((1 + size) / (1 + df[terms])) + 1).astype(np.float32)
+
+    vectors = tf @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ vectors, dtype=np.float32)
+
+
+def get_entry_bounds(vectors, transposed):
+    """Upper bound of each post's non-zero similarities: the summed document frequency of its words"""
+    document_frequency = np.diff(transposed.indptr)
+    words = vectors.copy()
+    words.data[:] = 1
+    return words @ document_frequency
+
+
+def iter_batches(rows, bounds, batch_size, max_entries=MAX_BATCH_ENTRIES):
+    """Split rows into batches of at most batch_size rows and about max_entries similarities"""
+    start = 0
+    while start < len(rows):
+        cumulative = np.cumsum(bounds[rows[start:start + batch_size]])
+        end = start + max(1, int(np.searchsorted(cumulative, max_entries, side='right')))
+        yield rows[start:end]
+        start = end
+
+
+def get_similarities(vectors, transposed, rows):
+    """
+    Sparse (CSR) len(rows) x posts cosine similarities above MIN_SCORE,
+    without each row's similarity to itself
+    """
+    similarities = (vectors[rows] @ transposed).tocsr()
+    source = np.repeat(rows, np.diff(similarities.indptr))
+    similarities.data[(similarities.indices == source) | (similarities.data <= MIN_SCORE)] = 0
+    similarities.eliminate_zeros()
+    return similarities
+
+
+def top_neighbours(similarities, count):
+    """
+    return: a (columns, scores) pair per row, the `count` best entries best first
+    """
+    neighbours = []
+    for start, end in zip(similarities.indptr[:-1], similarities.indptr[1:]):
+        columns, scores = similarities.indices[start:end], similarities.data[start:end]
+        if len(scores) > count:
+            best = np.argpartition(-scores, count - 1)[:count]
+            columns, scores = columns[best], scores[best]
+        order = np.argsort(-scores, kind='stable')
+        neighbours.append((columns[order], scores[order]))
+    return neighbours
+
+
+def refresh(full=False, count=RELATED_COUNT, batch_size=BATCH_SIZE):
+    """
+    Recompute and store related posts.
+    full: recompute every list instead of the changed and affected ones
+    return: (number of lists recomputed, number of posts)
+    """
+    from .models import Post, RelatedPost
+
+    built_at = timezone.now()
+    posts = list(Post.objects.order_by('id').values_list('id', 'title', 'excerpt'))
+    if not posts:
+        return 0, 0
+    ids = np.array([pk for pk, _, _ in posts], dtype=np.int64)
+    rows = {pk: row for row, pk in enumerate(ids.tolist())}
+    vectors = build_vectors([(title, excerpt) for _, title, excerpt in posts])
+    transposed = vectors.T.tocsr()
+
+    if full:
+        changed = np.arange(len(ids))
+    else:
+        changed_ids = Post.objects.filter(
+            Q(related_build__isnull=True) | Q(update_at__gt=F('related_build__built_at'))
+        ).values_list('id', flat=True)
+        # posts created after the corpus was read wait for the next refresh
+        changed = np.array([rows[pk] for pk in changed_ids if pk in rows], dtype=np.int64)
+
+    # a changed post can enter a list by beating its weakest entry, or leave it
+    affected = np.zeros(len(ids), dtype=bool)
+    thresholds = np.full(len(ids), MIN_SCORE, dtype=np.float32)
+    if not full and len(changed):
+        lists = RelatedPost.objects.values('post_id').annotate(size=Count('id'), weakest=Min('score'))
+        for entry in lists:
+            if entry['size'] >= count and entry['post_id'] in rows:
+                thresholds[rows[entry['post_id']]] = entry['weakest']
+        listing = RelatedPost.objects.filter(related_id__in=ids[changed].tolist()).values_list('post_id', flat=True)
+        affected[[rows[pk] for pk in listing if pk in rows]] = True
+
+    bounds = get_entry_bounds(vectors, transposed)
+    for batch in iter_batches(changed, bounds, batch_size):
+        similarities = get_similarities(vectors, transposed, batch)
+        if not full:
+            affected[similarities.indices[similarities.data > thresholds[similarities.indices]]] = True
+        _save_lists(ids, batch, top_neighbours(similarities, count), built_at)
+
+    affected[changed] = False
+    others = np.flatnonzero(affected)
+    for batch in iter_batches(others, bounds, batch_size):
+        similarities = get_similarities(vectors, transposed, batch)
+        _save_lists(ids, batch, top_neighbours(similarities, count), built_at)
+
+    return len(changed) + len(others), len(ids)
+
+
+def _save_lists(ids, rows, neighbours, built_at):
+    from .models import RelatedPost, RelatedPostsBuild
+
+    post_ids = ids[rows].tolist()
+    links = [
+        RelatedPost(post_id=post_id, related_id=int(ids[column]), rank=rank, score=float(score))
+        for post_id, (columns, scores) in zip(post_ids, neighbours)
+        for rank, (column, score) in enumerate(zip(columns, scores))
+    ]
+    with transaction.atomic():
+        RelatedPost.objects.filter(post_id__in=post_ids).delete()
+        RelatedPost.objects.bulk_create(links)
+        RelatedPostsBuild.objects.bulk_create(
+            [RelatedPostsBuild(post_id=post_id, built_at=built_at) for post_id in post_ids],
+            update_conflicts=True, unique_fields=['post'], update_fields=['built_at'],
+        )
@@ -0,0 +1,191 @@
+"""
+Full-text search over post titles and bodies.
+
+The index lives in its own table, keyed by post id and created by migration
+0011 for the database in use:
+
+- PostgreSQL: posts_post_search(post_id, document tsvector) with a GIN index;
+  the title is weighted above the body and ranking uses ts_rank_cd.
+- SQLite: an FTS5 table posts_post_search(title, content) with rowid = post
+  id, ranked by bm25.
+
+Other databases have no index and fall back to icontains. Post.save keeps
+the index up to date, see index_post, and a post_delete receiver removes
+rows; the table has no foreign key to posts_post, which would stop flush
+from truncating it. `manage.py rebuild_search_index` reindexes rows written
+without save() (e.g. bulk_create).
+"""
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+
+SEARCH_TABLE = 'posts_post_search'
+SEARCH_CONFIG = 'english'
+# title matches count this much more than body matches (SQLite bm25 weights)
+TITLE_WEIGHT = 10.0
+REBUILD_BATCH_SIZE = 2000
+
+WORD_RE = re.compile(r'\w+')
+
+
+def _vendor(using='default'):
+    return connections[using].vendor
+
+
+def is_supported(using='default'):
+    return _vendor(using) in ('postgresql', 'sqlite')
+
+
+# --- schema, used by migration 0011 ---
+
+def create_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE {SEARCH_TABLE} ('
+            f'post_id bigint PRIMARY KEY, '
+            f'document tsvector NOT NULL)'
+        )
+        schema_editor.execute(f'CREATE INDEX {SEARCH_TABLE}_document_idx ON {SEARCH_TABLE} USING GIN (document)')
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(title, content, tokenize='porter unicode61')"
+        )
+
+
+def drop_index(schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def drop_post_foreign_key(schema_editor):
+    # migration 0015: flush (and TransactionTestCase teardown) truncates posts_post
+    # only, which PostgreSQL refuses while an unmanaged table references it
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'ALTER TABLE {SEARCH_TABLE} DROP CONSTRAINT IF EXISTS {SEARCH_TABLE}_post_id_fkey')
+
+
+# --- keeping the index up to date ---
+
+# PostgreSQL builds the document from the stored rows, so the body never
+# has to be loaded into Python
+POSTGRES_UPSERT = f"""
+    INSERT INTO {SEARCH_TABLE} (post_id, document)
+    SELECT p.id,
+           setweight(to_tsvector('{SEARCH_CONFIG}', p.title), 'A')
+           || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(b.content, '')), 'B')
+    FROM posts_post p LEFT JOIN posts_postbody b ON b.post_id = p.id
+    WHERE {{where}}
+    ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document
+"""
+
+
+def index_post(post, content_changed, using='default'):
+    """
+    (Re)index a saved post. content_changed: the body was written too,
+    otherwise only the title changed.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(POSTGRES_UPSERT.format(where='p.id = %s'), [post.pk])
+        elif connection.vendor == 'sqlite':
+            if not content_changed:
+                cursor.execute(f'UPDATE {SEARCH_TABLE} SET title = %s WHERE rowid = %s', [post.title, post.pk])
+                if cursor.rowcount:
+                    return
+            cursor.execute(
+                f'INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, title, content) VALUES (%s, %s, %s)',
+                [post.pk, post.title, strip_tags(post.content)],
+            )
+
+
+def remove_post(pk, using='default'):
+    # called from post_delete; the table has no foreign key to cascade from
+    vendor = _vendor(using)
+    if vendor in ('postgresql', 'sqlite'):
+        key = 'post_id' if vendor == 'postgresql' else 'rowid'
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE {key} = %s', [pk])
+
+
+def rebuild(using='default', batch_size=REBUILD_BATCH_SIZE, post_model=None):
+    """
+    Reindex every post. post_model: the Post model to read, for migrations.
+    return: number of posts indexed
+    """
+    if post_model is None:
+        from .models import Post as post_model
+
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            cursor.execute(POSTGRES_UPSERT.format(where='TRUE'))
+            return cursor.rowcount
+    if connection.vendor != 'sqlite':
+        return 0
+
+    count, last_id = 0, 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        while True:
+            rows = list(
+                post_model.objects.using(using).filter(id__gt=last_id).order_by('id')
+                .values_list('id', 'title', 'body__content')[:batch_size]
+            )
+            if not rows:
+                return count
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, content) VALUES (%s, %s, %s)',
+                [(pk, title, strip_tags(content or '')) for pk, title, content in rows],
+            )
+            count += len(rows)
+            last_id = rows[-1][0]
+
+
+# --- querying ---
+
+def get_terms(q):
+    return WORD_RE.findall(q)
+
+
+def _fts5_query(q):
+    # every word must match; quoting keeps FTS5 operators in user input literal
+    return ' '.join(f'"{term}"' for term in get_terms(q))
+
+
+def search_posts(queryset, q, using='default'):
+    """
+    Filter a Post queryset to the posts matching `q` and annotate `rank`
+    (higher is better). The caller orders by it.
+    """
+    vendor = _vendor(using)
+    table = queryset.model._meta.db_table
+
+    if vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT post_id FROM {SEARCH_TABLE} WHERE document @@ {tsquery}', [q])
+        ).annotate(rank=RawSQL(
+            f'SELECT ts_rank_cd(s.document, {tsquery}) FROM {SEARCH_TABLE} s WHERE s.post_id = {table}.id',
+            [q], output_field=FloatField(),
+        ))
+
+    if vendor == 'sqlite':
+        # bm25() only works in the query that runs the MATCH, and a correlated
+        # subquery would rerun it per row: join the FTS table instead
+        return queryset.extra(
+            select={'rank': f'-bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, 1.0)'},
+            tables=[SEARCH_TABLE],
+            where=[f'{SEARCH_TABLE}.rowid = {table}.id', f'{SEARCH_TABLE} MATCH %s'],
+            params=[_fts5_query(q)],
+        )
+
+    # no index: every word in the title or body, unranked
+    for term in get_terms(q):
+        queryset = queryset.filter(Q(title__icontains=term) | Q(body__content__icontains=term))
+    return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
@@ -1,16 +1,63 @@
 from rest_framework import serializers
+from drf_spectacular.utils import extend_schema_field
+from drf_spectacular.types import OpenApiTypes
 from .models import Post
 from users.serializers import UserSerializer
-from .permissions import validate_permission_hierarchy_values
+from .permissions import validate_permission_hierarchy_values, get_user_permission_level
 
-class PostSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """
+    Takes an optional `fields` argument (e.g. from ?fields=) and only
+    serializes those fields
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+class PostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     # author = serializers.ReadOnlyField(source='author.username') #only read
 
     author = UserSerializer(read_only=True)
+    # stored in PostBody, see Post.content
+    content = serializers.CharField()
+
+    # Per viewer state, normally annotated by the list queryset (see PostListCreateView)
+    liked_by_me = serializers.SerializerMethodField()
+    my_access = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ['id', 'author', 'title', 'content', 'excerpt', 'created_at', 'author_access', 'team_access', 'authenticated_access', 'public_access']
+        fields = ['id', 'author', 'title', 'content', 'excerpt', 'created_at', 'likes_count', 'author_access', 'team_access', 'authenticated_access', 'public_access', 'liked_by_me', 'my_access']
+        read_only_fields = ['likes_count']
+
+    def _get_viewer(self):
+        request = self.context.get('request')
+        return getattr(request, 'user', None)
+
+    @extend_schema_field(OpenApiTypes.BOOL)
+    def get_liked_by_me(self, obj):
+        if hasattr(obj, 'liked_by_me'):
+            return obj.liked_by_me
+
+        user = self._get_viewer()
+        if user is None:
+            return None
+        return user.is_authenticated and obj.likes.filter(user=user).exists()
+
+    @extend_schema_field(serializers.ChoiceField(choices=['none', 'read', 'write']))
+    def get_my_access(self, obj):
+        if hasattr(obj, 'my_access'):
+            return obj.my_access
+
+        user = self._get_viewer()
+        if user is None:
+            return None
+        return get_user_permission_level(user, obj)
 
     def validate(self, attrs):
         instance = getattr(self, 'instance', None)
@@ -27,15 +74,28 @@ class PostSerializer(serializers.ModelSerializer):
         
         return attrs
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     
     author = UserSerializer(read_only=True)
+    content = serializers.CharField(read_only=True)
 
     class Meta:
         model = Post
-        fields = ['id','author', 'title', 'content', 'excerpt', 'created_at', 'update_at', 'author_access', 'team_access', 'authenticated_access', 'public_access']
+        fields = ['id','author', 'title', 'content', 'excerpt', 'created_at', 'update_at', 'likes_count', 'author_access', 'team_access', 'authenticated_access', 'public_access']
+
+class RelatedPostSerializer(serializers.ModelSerializer):
+
+    author = UserSerializer(read_only=True)
+    # similarity to the post the list belongs to, annotated by PostRelatedView
+    score = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Post
+        fields = ['id', 'author', 'title', 'excerpt', 'created_at', 'likes_count', 'score']
 
 class PostUpdateSerializer(serializers.ModelSerializer):
+    content = serializers.CharField()
+
     class Meta:
         model = Post
         # Input payload for updates should only include mutable fields
@@ -55,4 +115,13 @@ class PostUpdateSerializer(serializers.ModelSerializer):
         if errors:
             raise serializers.ValidationError(errors)
         
-        return attrs
\ No newline at end of file
+        return attrs
+
+    def update(self, instance, validated_data):
+        # Only write the columns that really changed; permission-only edits
+        # leave content, excerpt and the PostBody row alone
+        changed = [name for name, value in validated_data.items() if getattr(instance, name) != value]
+        for name in changed:
+            setattr(instance, name, validated_data[name])
+        instance.save(update_fields=changed)
+        return instance
\ No newline at end of file
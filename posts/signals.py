@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache, search, suggest
+from .models import Post
+from .permissions import READ_TIER_AUTHOR, READ_TIER_PUBLIC
+
+# User columns shown in post responses (UserSerializer)
+AUTHOR_FIELDS = {'username', 'email', 'role', 'team', 'team_id'}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_author_team(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Keep Post.author_team in line with the author's team.
+    A single bulk UPDATE touches only the posts that are out of date.
+    Note: QuerySet.update() on users bypasses this signal.
+    """
+    if created:
+        return
+    if update_fields is not None and not {'team', 'team_id'} & set(update_fields):
+        return
+
+    Post.objects.filter(author_id=instance.pk).exclude(
+        author_team_id=instance.team_id
+    ).update(author_team_id=instance.team_id)
+
+
+# Likes made through the ORM (admin, Like.objects.create, cascades from a
+# deleted user). LikeManager.add_like/remove_like use raw SQL, send no
+# signals and adjust likes_count themselves.
+
+@receiver(post_save, sender='likes.Like')
+def count_saved_like(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') + 1)
+
+
+@receiver(post_delete, sender='likes.Like')
+def count_deleted_like(sender, instance, origin=None, **kwargs):
+    # the likes of a deleted post go with it, no need to count them down
+    if isinstance(origin, Post) or getattr(origin, 'model', None) is Post:
+        return
+    Post.objects.filter(pk=instance.post_id).update(likes_count=Greatest(F('likes_count') - 1, 0))
+
+
+# Anonymous response cache invalidation, see posts.cache.
+# Comments are not part of post responses, so they invalidate nothing.
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_responses(sender, instance, signal, created=False, **kwargs):
+    """The lists only change when the post is, or was, visible to anonymous users"""
+    stored_read_tier = READ_TIER_AUTHOR if created else getattr(instance, '_stored_read_tier', None)
+    was_public = stored_read_tier in (None, READ_TIER_PUBLIC)
+    now_public = signal is post_save and cache.is_public(instance)
+    cache.invalidate_post(instance.pk, public=now_public or was_public, hidden=was_public and not now_public)
+    instance._stored_read_tier = instance.__dict__.get('read_tier')
+
+
+@receiver(post_save, sender='likes.Like')
+@receiver(post_delete, sender='likes.Like')
+def invalidate_liked_post_responses(sender, instance, **kwargs):
+    """likes_count changed. LikeManager's raw SQL likes invalidate explicitly."""
+    cache.invalidate_post(instance.post_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_author_responses(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and not AUTHOR_FIELDS & set(update_fields):
+        return
+    cache.invalidate_author(instance.pk)
+
+
+@receiver(post_save, sender='users.Team')
+@receiver(post_delete, sender='users.Team')
+def invalidate_team_responses(sender, instance, created=False, **kwargs):
+    if not created:
+        cache.invalidate_team(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    search.remove_post(instance.pk, using=using)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def clear_title_suggestions(sender, **kwargs):
+    """Titles, visibility or a viewer's team changed; other processes catch up after SUGGEST_TTL"""
+    suggest.suggestions.clear()
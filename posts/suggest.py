@@ -0,0 +1,183 @@
+"""
+As-you-type post title suggestions.
+
+Titles starting with the typed text come first, in title order, read from
+an index on lower(title) created by migration 0012 (text_pattern_ops on
+PostgreSQL, a plain expression index range scanned on SQLite). Remaining
+slots are filled with fuzzy matches: pg_trgm similarity on PostgreSQL,
+word prefixes from the FTS5 search table (see posts.search) on SQLite.
+Prefixes fold case the way the database's lower() does: Unicode aware on
+PostgreSQL, ASCII letters only on SQLite.
+
+Results are kept per viewer in a small in-process TTL LRU, so hot prefixes
+skip the database; posts.signals clears it when posts or users change in
+this process, other processes see changes after SUGGEST_TTL seconds.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+
+from .search import SEARCH_TABLE, get_terms
+
+SUGGEST_TTL = 30
+SUGGEST_CACHE_SIZE = 2048
+# pg_trgm similarity() threshold for fuzzy matches
+TRIGRAM_THRESHOLD = 0.3
+
+
+class TTLLRUCache:
+    """Thread safe LRU mapping whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, maxsize=SUGGEST_CACHE_SIZE, ttl=SUGGEST_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+suggestions = TTLLRUCache()
+
+
+# --- schema, used by migration 0012 ---
+
+def create_indexes(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute('CREATE INDEX posts_post_title_prefix_idx ON posts_post (lower(title) text_pattern_ops)')
+        schema_editor.execute('CREATE INDEX posts_post_title_trgm_idx ON posts_post USING GIN (lower(title) gin_trgm_ops)')
+    elif vendor == 'sqlite':
+        schema_editor.execute('CREATE INDEX posts_post_title_prefix_idx ON posts_post (lower(title))')
+
+
+def drop_indexes(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute('DROP INDEX IF EXISTS posts_post_title_prefix_idx')
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS posts_post_title_trgm_idx')
+
+
+# --- querying ---
+
+def get_viewer_key(user):
+    """Suggestions depend on what the viewer can read"""
+    if not user.is_authenticated:
+        return ('anonymous',)
+    return ('user', user.pk)
+
+
+def ascii_lower(text):
+    """Lowercase like SQLite's built-in lower(), which only folds ASCII letters"""
+    return ''.join(char.lower() if char.isascii() else char for char in text)
+
+
+def fold_case(text, using='default'):
+    """
+    `text` folded like prefix_matches folds it, so equal results share a key.
+    Unchanged on PostgreSQL, whose lower() follows the database locale.
+    """
+    if connections[using].vendor == 'sqlite':
+        return ascii_lower(text)
+    return text
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string above every string starting with `prefix`, None if there is none"""
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def prefix_matches(queryset, prefix, using='default'):
+    vendor = connections[using].vendor
+    table = queryset.model._meta.db_table
+
+    if vendor == 'postgresql':
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        # spelled like the index expression so text_pattern_ops is used; the
+        # database lowers the pattern too, so both sides fold case the same way
+        queryset = queryset.filter(RawSQL(f'lower({table}.title) LIKE lower(%s)', [escaped + '%'], output_field=BooleanField()))
+    elif vendor == 'sqlite':
+        # SQLite only uses the index for LIKE on NOCASE columns; a range works on lower(title)
+        prefix = fold_case(prefix, using)
+        upper = prefix_upper_bound(prefix)
+        queryset = queryset.alias(title_lower=Lower('title')).filter(title_lower__gte=prefix)
+        if upper is not None:
+            queryset = queryset.filter(title_lower__lt=upper)
+    else:
+        return queryset.filter(title__istartswith=prefix).order_by('title', 'id')
+    return queryset.order_by(Lower('title'), 'id')
+
+
+def fuzzy_matches(queryset, q, using='default'):
+    vendor = connections[using].vendor
+    table = queryset.model._meta.db_table
+
+    if vendor == 'postgresql':
+        similarity = RawSQL(f'similarity(lower({table}.title), lower(%s))', [q], output_field=FloatField())
+        return queryset.filter(
+            # `%` is the indexed trigram match operator, similarity() alone is not indexed
+            RawSQL(f'lower({table}.title) %% lower(%s)', [q], output_field=BooleanField())
+        ).annotate(similarity=similarity).filter(similarity__gte=TRIGRAM_THRESHOLD).order_by('-similarity', 'id')
+
+    terms = get_terms(q)
+    if vendor == 'sqlite':
+        # every typed word is the start of a title word
+        match = 'title : (' + ' '.join(f'"{term}" *' for term in terms) + ')'
+        return queryset.extra(
+            select={'fts_rank': f'bm25({SEARCH_TABLE})'},
+            tables=[SEARCH_TABLE],
+            where=[f'{SEARCH_TABLE}.rowid = {table}.id', f'{SEARCH_TABLE} MATCH %s'],
+            params=[match],
+        ).order_by('fts_rank', 'id')
+
+    query = Q()
+    for term in terms:
+        query &= Q(title__icontains=term)
+    return queryset.filter(query).order_by('title', 'id')
+
+
+def suggest_titles(queryset, q, limit, using='default'):
+    """
+    Up to `limit` {'id', 'title'} dicts: title prefix matches first, then fuzzy ones
+    """
+    results = list(prefix_matches(queryset, q, using).values('id', 'title')[:limit])
+    if len(results) < limit and get_terms(q):
+        seen = [row['id'] for row in results]
+        fuzzy = fuzzy_matches(queryset.exclude(id__in=seen), q, using).values('id', 'title')
+        results += list(fuzzy[:limit - len(results)])
+    return results
@@ -0,0 +1,426 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache as django_cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from blog_app_back.compiled_serializers import CompiledSerializer
+from comments.models import Comment
+from likes.models import Like
+from posts.models import Post
+from posts.cache import AnonymousResponseCacheMixin, bump, post_generation
+from posts.views import PostDetailView, PostListCreateView
+
+POST_LIST_URL = '/api/post/'
+POST_DETAIL_URL = lambda pk: f'/api/post/{pk}/'
+CACHE_STATS_URL = '/api/post/cache-stats/'
+
+
+def make_post(author, public=True, title="Post"):
+    access = "read" if public else "none"
+    return Post.objects.create(
+        author=author, title=title, content="<p>Body</p>",
+        team_access="read", authenticated_access="read", public_access=access,
+    )
+
+
+@pytest.fixture
+def author(create_user):
+    return create_user()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url,queries", [
+    (POST_LIST_URL, 0),
+    (POST_LIST_URL + "?fields=id,title", 0),
+    ("detail", 1),  # the detail's ETag freshness check
+])
+def test_anonymous_get_is_served_from_cache(client, author, url, queries):
+    post = make_post(author)
+    url = POST_DETAIL_URL(post.id) if url == "detail" else url
+
+    first = client.get(url)
+    assert first.status_code == status.HTTP_200_OK
+    assert first["X-Cache"] == "MISS"
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get(url)
+    assert second["X-Cache"] == "HIT"
+    assert len(ctx.captured_queries) == queries
+    assert second.json() == first.json()
+
+
+@pytest.mark.django_db
+def test_cache_key_includes_query_string(client, author):
+    make_post(author)
+    assert client.get(POST_LIST_URL + "?fields=id")["X-Cache"] == "MISS"
+    assert client.get(POST_LIST_URL + "?fields=title")["X-Cache"] == "MISS"
+    assert client.get(POST_LIST_URL + "?fields=id")["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_cache_key_includes_host_and_scheme(client, author, settings):
+    settings.ALLOWED_HOSTS = ["localhost", "api.example.com"]
+    for i in range(15):
+        make_post(author, title=f"Post {i}")
+
+    first = client.get(POST_LIST_URL, HTTP_HOST="localhost")
+    assert first.data["next"].startswith("http://localhost/")
+
+    other_host = client.get(POST_LIST_URL, HTTP_HOST="api.example.com")
+    assert other_host["X-Cache"] == "MISS"
+    assert other_host.data["next"].startswith("http://api.example.com/")
+
+    https = client.get(POST_LIST_URL, HTTP_HOST="localhost", secure=True)
+    assert https["X-Cache"] == "MISS"
+    assert https.data["next"].startswith("https://localhost/")
+
+    assert client.get(POST_LIST_URL, HTTP_HOST="localhost")["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_authenticated_requests_bypass_cache(auth_client, client):
+    api_client, user = auth_client()
+    make_post(user)
+    client.get(POST_LIST_URL)
+
+    response = api_client.get(POST_LIST_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Cache" not in response
+    assert response.data["results"][0]["my_access"] == "write"
+
+
+@pytest.mark.django_db
+def test_editing_public_post_invalidates_list_and_detail(client, author):
+    post = make_post(author)
+    client.get(POST_LIST_URL)
+    client.get(POST_DETAIL_URL(post.id))
+
+    post.title = "Renamed"
+    post.save(update_fields=["title"])
+
+    list_response = client.get(POST_LIST_URL)
+    detail_response = client.get(POST_DETAIL_URL(post.id))
+    assert list_response["X-Cache"] == detail_response["X-Cache"] == "MISS"
+    assert list_response.data["results"][0]["title"] == "Renamed"
+    assert detail_response.data["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_private_posts_do_not_invalidate_list(client, author):
+    make_post(author)
+    client.get(POST_LIST_URL)
+
+    private = make_post(author, public=False)
+    private.title = "Still private"
+    private.save()
+    assert client.get(POST_LIST_URL)["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_hiding_public_post_invalidates_list(client, author):
+    post = make_post(author)
+    client.get(POST_LIST_URL)
+
+    post = Post.objects.get(pk=post.pk)
+    post.public_access = "none"
+    post.save()
+
+    response = client.get(POST_LIST_URL)
+    assert response["X-Cache"] == "MISS"
+    assert response.data["results"] == []
+
+
+@pytest.mark.django_db
+def test_deleting_post_invalidates_list(client, author):
+    post = make_post(author)
+    client.get(POST_LIST_URL)
+
+    Post.objects.get(pk=post.pk).delete()
+    assert client.get(POST_LIST_URL).data["results"] == []
+
+
+@pytest.mark.django_db
+def test_like_endpoint_invalidates_likes_count(client, auth_client, author):
+    post = make_post(author)
+    api_client, _ = auth_client()
+    client.get(POST_LIST_URL)
+    client.get(POST_DETAIL_URL(post.id))
+
+    api_client.post(f'/api/post/{post.id}/like/')
+    assert client.get(POST_LIST_URL).data["results"][0]["likes_count"] == 1
+    assert client.get(POST_DETAIL_URL(post.id)).data["likes_count"] == 1
+
+    api_client.delete(f'/api/post/{post.id}/like/')
+    assert client.get(POST_LIST_URL).data["results"][0]["likes_count"] == 0
+
+
+@pytest.mark.django_db
+def test_like_rows_saved_with_the_orm_invalidate_post(client, create_user, author):
+    post = make_post(author)
+    client.get(POST_DETAIL_URL(post.id))
+
+    Like.objects.create(user=create_user(), post=post)
+    assert client.get(POST_DETAIL_URL(post.id))["X-Cache"] == "MISS"
+
+
+@pytest.mark.django_db
+def test_comments_do_not_invalidate(client, author):
+    post = make_post(author)
+    client.get(POST_LIST_URL)
+    client.get(POST_DETAIL_URL(post.id))
+
+    Comment.objects.create(user=author, post=post, content="Nice")
+    assert client.get(POST_LIST_URL)["X-Cache"] == "HIT"
+    assert client.get(POST_DETAIL_URL(post.id))["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_author_changes_invalidate_embedded_author(client, author):
+    post = make_post(author)
+    client.get(POST_LIST_URL)
+    client.get(POST_DETAIL_URL(post.id))
+
+    author.last_login = timezone.now()
+    author.save(update_fields=["last_login"])
+    assert client.get(POST_LIST_URL)["X-Cache"] == "HIT"
+
+    author.username = "renamed"
+    author.save()
+    assert client.get(POST_LIST_URL).data["results"][0]["author"]["username"] == "renamed"
+    assert client.get(POST_DETAIL_URL(post.id)).data["author"]["username"] == "renamed"
+
+    author.team.name = "Renamed Team"
+    author.team.save()
+    assert client.get(POST_LIST_URL).data["results"][0]["author"]["team"]["name"] == "Renamed Team"
+
+
+@pytest.mark.django_db
+def test_cache_stats_count_hits_and_misses(client, auth_client, author):
+    make_post(author)
+    client.get(POST_LIST_URL)
+    client.get(POST_LIST_URL)
+    client.get(POST_LIST_URL)
+
+    api_client, admin = auth_client()
+    admin.role = "admin"
+    admin.save(update_fields=["role"])
+    response = api_client.get(CACHE_STATS_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"hits": 2, "misses": 1, "stale": 0}
+
+
+@pytest.mark.django_db
+def test_cache_stats_are_admin_only(client, auth_client):
+    api_client, _ = auth_client()
+    assert api_client.get(CACHE_STATS_URL).status_code == status.HTTP_403_FORBIDDEN
+    assert client.get(CACHE_STATS_URL).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.fixture
+def feed(create_user, author):
+    other = create_user()
+    posts = [make_post(author if i % 2 else other, title=f"Post {i}") for i in range(6)]
+    Like.objects.create(user=other, post=posts[0])
+    return posts
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "?fields=id,title,likes_count,my_access", "?include=users", "?pagination=page"])
+def test_fragment_pages_match_uncached_serialization(monkeypatch, auth_client, feed, query):
+    api_client, _ = auth_client()
+    monkeypatch.setattr(PostListCreateView, "use_fragment_cache", False)
+    expected = api_client.get(POST_LIST_URL + query).json()
+
+    monkeypatch.setattr(PostListCreateView, "use_fragment_cache", True)
+    assert api_client.get(POST_LIST_URL + query).json() == expected  # cold
+    assert api_client.get(POST_LIST_URL + query).json() == expected  # from fragments
+
+
+@pytest.mark.django_db
+def test_warm_page_is_a_single_query(auth_client, feed):
+    api_client, _ = auth_client()
+    api_client.get(POST_LIST_URL)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(POST_LIST_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(ctx.captured_queries) == 2  # token + page
+
+
+@pytest.mark.django_db
+def test_only_changed_posts_are_serialized(monkeypatch, auth_client, feed):
+    api_client, _ = auth_client()
+    api_client.get(POST_LIST_URL)
+
+    feed[2].title = "Edited"
+    feed[2].save()
+
+    rendered = []
+    to_representation = CompiledSerializer.to_representation
+    monkeypatch.setattr(CompiledSerializer, "to_representation", lambda self, row: rendered.append(row["id"]) or to_representation(self, row))
+
+    response = api_client.get(POST_LIST_URL)
+    assert rendered == [feed[2].id]
+    assert {row["id"]: row["title"] for row in response.data["results"]}[feed[2].id] == "Edited"
+
+
+@pytest.mark.django_db
+def test_fragments_overlay_fresh_viewer_state(auth_client, feed):
+    api_client, viewer = auth_client()
+    api_client.get(POST_LIST_URL)
+
+    api_client.post(f'/api/post/{feed[3].id}/like/')
+    row = {row["id"]: row for row in api_client.get(POST_LIST_URL).data["results"]}[feed[3].id]
+    assert row["likes_count"] == 1
+    assert row["liked_by_me"] is True
+
+
+@pytest.mark.django_db
+def test_author_and_team_changes_refresh_their_fragments(auth_client, feed, author):
+    api_client, _ = auth_client()
+    api_client.get(POST_LIST_URL)
+
+    author.username = "renamed"
+    author.save(update_fields=["username"])
+    authors = {row["id"]: row["author"] for row in api_client.get(POST_LIST_URL).data["results"]}
+    assert authors[feed[1].id]["username"] == "renamed"
+    assert authors[feed[0].id]["username"] != "renamed"
+
+    author.team.name = "Renamed Team"
+    author.team.save()
+    results = api_client.get(POST_LIST_URL).data["results"]
+    assert all(row["author"]["team"]["name"] == "Renamed Team" for row in results)
+
+
+class SlowView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    delay = 0.2
+
+    def get(self, request, *args, **kwargs):
+        time.sleep(self.delay)
+        SlowView.computed += 1
+        return Response({"computed": SlowView.computed})
+
+
+class CachedSlowView(AnonymousResponseCacheMixin, SlowView):
+    def get_cache_generations(self):
+        return [post_generation(1)]
+
+
+@pytest.fixture
+def slow_view():
+    SlowView.computed = 0
+    return CachedSlowView
+
+
+def cache_keys(view_class, path='/slow/', **kwargs):
+    view = view_class()
+    view.kwargs = kwargs
+    return view.get_response_cache_keys(Request(APIRequestFactory().get(path)))
+
+
+def test_concurrent_misses_are_computed_once(slow_view):
+    view = slow_view.as_view()
+    barrier = threading.Barrier(8)
+
+    def fetch():
+        barrier.wait()
+        response = view(APIRequestFactory().get('/slow/'))
+        return response["X-Cache"], response.data
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: fetch(), range(8)))
+
+    assert SlowView.computed == 1
+    assert sorted(status for status, _ in results) == ["HIT"] * 7 + ["MISS"]
+    assert all(data == {"computed": 1} for _, data in results)
+
+
+def test_stale_response_is_served_while_another_worker_recomputes(slow_view):
+    view = slow_view.as_view()
+    view(APIRequestFactory().get('/slow/'))
+    bump(post_generation(1))
+
+    key, _ = cache_keys(slow_view)
+    assert django_cache.add(f"{key}:lock", 1)  # held by another process
+    response = view(APIRequestFactory().get('/slow/'))
+    assert response["X-Cache"] == "STALE"
+    assert response.data == {"computed": 1}
+    assert SlowView.computed == 1
+
+
+def test_waits_for_other_worker_then_recomputes_on_timeout(monkeypatch, slow_view):
+    monkeypatch.setattr(slow_view, "cache_wait_timeout", 0.05)
+    key, _ = cache_keys(slow_view)
+    django_cache.add(f"{key}:lock", 1)
+
+    response = slow_view.as_view()(APIRequestFactory().get('/slow/'))
+    assert response["X-Cache"] == "MISS"
+    assert SlowView.computed == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("change", ["hide", "delete"])
+def test_hidden_post_is_not_served_stale_in_lists(monkeypatch, client, author, change):
+    post = make_post(author, title="Secret soon")
+    make_post(author, title="Stays public")
+    first = client.get(POST_LIST_URL)
+    assert first["X-Cache"] == "MISS"
+    assert "Secret soon" in [row["title"] for row in first.data["results"]]
+
+    if change == "hide":
+        post.public_access = "none"
+        post.save()
+    else:
+        post.delete()
+
+    # another worker holds the lock: the last list may not be served stale
+    monkeypatch.setattr(PostListCreateView, "cache_wait_timeout", 0.05)
+    key, _ = cache_keys(PostListCreateView, POST_LIST_URL)
+    django_cache.add(f"{key}:lock", 1)
+    response = client.get(POST_LIST_URL)
+    assert response["X-Cache"] != "STALE"
+    assert [row["title"] for row in response.data["results"]] == ["Stays public"]
+
+
+@pytest.mark.django_db
+def test_edited_post_list_is_served_stale_while_recomputing(monkeypatch, client, author):
+    post = make_post(author, title="Old title")
+    client.get(POST_LIST_URL)
+
+    post.title = "New title"
+    post.save()
+    monkeypatch.setattr(PostListCreateView, "cache_wait_timeout", 0.05)
+    key, _ = cache_keys(PostListCreateView, POST_LIST_URL)
+    django_cache.add(f"{key}:lock", 1)
+    response = client.get(POST_LIST_URL)
+    assert response["X-Cache"] == "STALE"
+    assert response.data["results"][0]["title"] == "Old title"
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_served_stale(monkeypatch, client, author):
+    post = make_post(author)
+    client.get(POST_DETAIL_URL(post.id))
+
+    post.public_access = "none"
+    post.save()
+    assert client.get(POST_DETAIL_URL(post.id)).status_code == status.HTTP_404_NOT_FOUND
+
+    # another worker is recomputing: nothing stale to fall back on
+    post.title = "Hidden"
+    post.save()
+    monkeypatch.setattr(PostDetailView, "cache_wait_timeout", 0.05)
+    key, _ = cache_keys(PostDetailView, POST_DETAIL_URL(post.id), pk=post.id)
+    django_cache.add(f"{key}:lock", 1)
+    assert client.get(POST_DETAIL_URL(post.id)).status_code == status.HTTP_404_NOT_FOUND
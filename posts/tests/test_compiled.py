@@ -0,0 +1,80 @@
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIClient
+from likes.models import Like
+from posts.models import Post
+from posts.views import PostListCreateView
+from users.models import Team, User
+
+POST_LIST_URL = '/api/post/'
+
+
+def get_both(monkeypatch, client, url, view=PostListCreateView):
+    """Response bodies with the compiled serializer and with the regular one"""
+    bodies = []
+    for compiled in (True, False):
+        monkeypatch.setattr(view, "use_compiled_serializer", compiled)
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        bodies.append(response.content)
+    return bodies
+
+
+@pytest.fixture
+def posts(create_user):
+    team = Team.objects.create(name="Team A")
+    author = create_user(team=team)
+    loner = User.objects.create_user(email="loner@example.com", username="loner", password="x")
+    posts = []
+    for i, (user, profile) in enumerate([
+        (author, ("read", "read", "read")),
+        (author, ("write", "read", "none")),
+        (loner, ("read", "read", "read")),
+        (author, ("read", "none", "none")),
+    ] * 6):
+        team_access, authenticated_access, public_access = profile
+        posts.append(Post.objects.create(
+            author=user, title=f"Post {i}", content=f"<p>Body {i}   \"quoted\" &amp; more</p>",
+            team_access=team_access, authenticated_access=authenticated_access, public_access=public_access,
+        ))
+    Like.objects.add_like(author, posts[0])
+    return author, posts
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", [
+    "",
+    "?fields=id,title,excerpt",
+    "?fields=author,liked_by_me,my_access",
+    "?ordering=-likes_count",
+    "?ordering=created_at&fields=id",
+    "?pagination=page",
+    "?page=2",
+])
+def test_compiled_post_list_is_byte_identical(monkeypatch, auth_client, posts, query):
+    author, _ = posts
+    client, _ = auth_client(team=author.team)
+    compiled, regular = get_both(monkeypatch, client, POST_LIST_URL + query)
+    assert compiled == regular
+
+    # anonymous responses are cached: compute both instead of replaying the first
+    anonymous = APIClient()
+    bodies = []
+    for use_compiled in (True, False):
+        monkeypatch.setattr(PostListCreateView, "use_compiled_serializer", use_compiled)
+        cache.clear()
+        response = anonymous.get(POST_LIST_URL + query)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+        bodies.append(response.content)
+    assert bodies[0] == bodies[1]
+
+
+@pytest.mark.django_db
+def test_compiled_post_list_cursor_pages(monkeypatch, client, posts):
+    monkeypatch.setattr(PostListCreateView, "use_compiled_serializer", True)
+    next_url = client.get(POST_LIST_URL).data["next"]
+
+    compiled, regular = get_both(monkeypatch, client, next_url)
+    assert compiled == regular
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from posts.models import Post
+
+POST_DETAIL_URL = lambda pk: f'/api/post/{pk}/'
+
+
+@pytest.fixture
+def post(create_user):
+    return Post.objects.create(
+        author=create_user(), title="Post", content="<p>Body</p>",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+
+
+def revalidate(client, post, **headers):
+    return client.get(POST_DETAIL_URL(post.id), headers=headers)
+
+
+@pytest.mark.django_db
+def test_detail_sends_validators(client, post):
+    response = client.get(POST_DETAIL_URL(post.id))
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"].startswith('"')
+    assert response["Last-Modified"]
+    assert "no-cache" in response["Cache-Control"]
+
+
+@pytest.mark.django_db
+def test_unchanged_detail_is_not_modified_after_one_query(client, post):
+    etag = client.get(POST_DETAIL_URL(post.id))["ETag"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = revalidate(client, post, if_none_match=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert not response.content
+    [sql] = [q["sql"] for q in ctx.captured_queries]
+    assert "posts_postbody" not in sql and "users_user" not in sql
+
+
+@pytest.mark.django_db
+def test_if_modified_since(client, post):
+    last_modified = client.get(POST_DETAIL_URL(post.id))["Last-Modified"]
+    assert revalidate(client, post, if_modified_since=last_modified).status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_edits_likes_and_author_changes_change_the_etag(client, auth_client, post):
+    api_client, _ = auth_client()
+    etags = [client.get(POST_DETAIL_URL(post.id))["ETag"]]
+
+    post.title = "Edited"
+    post.save(update_fields=["title"])
+    etags.append(client.get(POST_DETAIL_URL(post.id))["ETag"])
+
+    api_client.post(f'/api/post/{post.id}/like/')
+    etags.append(client.get(POST_DETAIL_URL(post.id))["ETag"])
+
+    post.author.username = "renamed"
+    post.author.save(update_fields=["username"])
+    response = revalidate(client, post, if_none_match=etags[-1])
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["author"]["username"] == "renamed"
+    etags.append(response["ETag"])
+
+    assert len(set(etags)) == 4
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_format(client, post):
+    json_etag = client.get(POST_DETAIL_URL(post.id))["ETag"]
+    response = client.get(POST_DETAIL_URL(post.id), HTTP_ACCEPT="text/html", HTTP_IF_NONE_MATCH=json_etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != json_etag
+
+
+@pytest.mark.django_db
+def test_revalidation_still_checks_read_access(client, auth_client, post):
+    etag = client.get(POST_DETAIL_URL(post.id))["ETag"]
+    Post.objects.filter(pk=post.pk).update(public_access="none", read_tier=0)
+
+    assert revalidate(client, post, if_none_match=etag).status_code == status.HTTP_404_NOT_FOUND
+    assert revalidate(client, post, if_none_match="*").status_code == status.HTTP_404_NOT_FOUND
@@ -69,4 +69,28 @@ def test_post_excerpt_is_generated_and_limited(auth_client):
     assert post.excerpt is not None
     assert len(post.excerpt) <= 200
     # Excerpt must be exactly the first 200 characters
-    assert post.excerpt == long_content[:200]
\ No newline at end of file
+    assert post.excerpt == long_content[:200]
+
+@pytest.mark.django_db
+def test_admin_creates_and_edits_post_content(client, create_user):
+    admin = create_user(email="admin@example.com", password="adminpass123")
+    admin.is_staff = admin.is_superuser = True
+    admin.save()
+    client.force_login(admin)
+    data = {
+        'author': admin.pk, 'title': 'From the admin', 'content': '<p>Admin body</p>', 'likes_count': 0,
+        'author_access': 'write', 'team_access': 'none', 'authenticated_access': 'none', 'public_access': 'read',
+    }
+    response = client.post('/admin/posts/post/add/', data)
+    assert response.status_code == status.HTTP_302_FOUND
+    post = Post.objects.get(title='From the admin')
+    assert post.body.content == '<p>Admin body</p>'
+    assert post.excerpt == 'Admin body'
+
+    response = client.get(f'/admin/posts/post/{post.pk}/change/')
+    assert '&lt;p&gt;Admin body&lt;/p&gt;' in response.content.decode()
+
+    response = client.post(f'/admin/posts/post/{post.pk}/change/', {**data, 'content': 'Edited'})
+    assert response.status_code == status.HTTP_302_FOUND
+    post = Post.objects.get(pk=post.pk)
+    assert (post.content, post.excerpt) == ('Edited', 'Edited')
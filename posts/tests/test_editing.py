@@ -1,7 +1,10 @@
 import pytest 
 from rest_framework.test import APIClient
 from rest_framework import status
-from posts.models import Post
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from posts.models import Post, PostBody
+from posts.permissions import READ_TIER_AUTHENTICATED
 from users.models import Team
 
 POST_UPDATE_URL = lambda pk: f"/api/blog/{pk}/"
@@ -88,3 +91,51 @@ def test_user_with_same_team_as_author_can_edit(auth_client):
 
     response = admin_client.put(POST_UPDATE_URL(post.id), payload, format="json")
     assert response.status_code == status.HTTP_200_OK
+
+
+def post_writes(ctx):
+    return [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(("UPDATE", "INSERT", "DELETE"))]
+
+
+@pytest.mark.django_db
+def test_permission_only_patch_writes_only_changed_columns(auth_client):
+    client, user = auth_client()
+    post = Post.objects.create(author=user, title="Narrow", content="<p>Body</p>")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.patch(POST_UPDATE_URL(post.id), {"team_access": "read", "authenticated_access": "read"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    [sql] = post_writes(ctx)
+    assert '"authenticated_access"' in sql and '"read_tier"' in sql and '"update_at"' in sql
+    assert '"title"' not in sql and '"excerpt"' not in sql
+    post.refresh_from_db()
+    assert post.read_tier == READ_TIER_AUTHENTICATED
+
+
+@pytest.mark.django_db
+def test_content_patch_rewrites_body_and_excerpt(auth_client):
+    client, user = auth_client()
+    post = Post.objects.create(author=user, title="Body", content="<p>Old</p>")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.patch(POST_UPDATE_URL(post.id), {"content": "<p>New</p>"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    post_update, body_update, search_update = post_writes(ctx)
+    assert '"excerpt"' in post_update and '"title"' not in post_update
+    assert "posts_postbody" in body_update
+    assert "posts_post_search" in search_update
+    assert PostBody.objects.get(post=post).content == "<p>New</p>"
+    assert Post.objects.get(pk=post.pk).excerpt == "New"
+
+
+@pytest.mark.django_db
+def test_unchanged_patch_writes_nothing(auth_client):
+    client, user = auth_client()
+    post = Post.objects.create(author=user, title="Same", content="Same")
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.patch(POST_UPDATE_URL(post.id), {"title": "Same", "content": "Same"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert post_writes(ctx) == []
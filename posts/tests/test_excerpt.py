@@ -0,0 +1,82 @@
+import pytest
+from django.utils.html import MLStripper, strip_tags
+from posts.models import Post
+from posts.utils import EXCERPT_LENGTH, build_excerpt, truncate_excerpt
+
+
+def strip_tags_excerpt(html, length=EXCERPT_LENGTH):
+    return truncate_excerpt(' '.join(strip_tags(html).split()), length)
+
+
+LONG_HTML = '<article>' + '<p>Lorem <b>ipsum</b> dolor &amp; sit amet.</p>\n' * 2000 + '</article>'
+
+
+@pytest.mark.parametrize("html", [
+    "",
+    "plain text without markup",
+    "a &amp b without tags",
+    "<p>Hello <b>world</b></p>",
+    "<p>" + "word " * 100 + "</p>",
+    "x" * 500,
+    "<p>" + "x" * 500 + "</p>",
+    "a < b and c > d " * 30,
+    "<<b>b>hidden</b> tag " * 30,
+    "&#z; broken &#x reference <b>bold</b> " * 20,
+    "<script>var a = 1 < 2;</script>" + "text " * 60,
+    LONG_HTML,
+])
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_build_excerpt_matches_strip_tags(html, chunk_size):
+    assert build_excerpt(html, chunk_size=chunk_size) == strip_tags_excerpt(html)
+
+
+@pytest.mark.parametrize("reference", ["&ab", "&amp", "&notit", "&" + "x" * 40, "&copy;"])
+@pytest.mark.parametrize("offset", [1, 2, 3, 35, 40])
+def test_build_excerpt_reference_across_chunks(monkeypatch, reference, offset):
+    html = "<p>" + "w" * (4096 - 3 - offset) + reference + "y tail</p>"
+    expected = strip_tags_excerpt(html, length=5000)
+    chunks = []
+    original_feed = MLStripper.feed
+
+    def recording_feed(self, data):
+        chunks.append(data)
+        original_feed(self, data)
+
+    monkeypatch.setattr(MLStripper, "feed", recording_feed)
+
+    assert build_excerpt(html, length=5000) == expected
+    # the reference is handed to the parser in one piece
+    assert any(reference in chunk for chunk in chunks)
+
+
+def test_build_excerpt_stops_parsing_early(monkeypatch):
+    expected = strip_tags_excerpt(LONG_HTML)
+    fed = []
+    original_feed = MLStripper.feed
+
+    def counting_feed(self, data):
+        fed.append(len(data))
+        original_feed(self, data)
+
+    monkeypatch.setattr(MLStripper, "feed", counting_feed)
+
+    assert build_excerpt(LONG_HTML, chunk_size=1024) == expected
+    assert sum(fed) == 1024
+
+
+@pytest.mark.django_db
+def test_excerpt_is_kept_when_content_is_unchanged(create_user):
+    user = create_user()
+    post = Post.objects.create(author=user, title="Excerpt", content="<p>Original body</p>")
+    Post.objects.filter(pk=post.pk).update(excerpt="Edited by hand")
+
+    post = Post.objects.get(pk=post.pk)
+    post.title = "Renamed"
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == "Edited by hand"
+
+    post.content = "<p>New body</p>"
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == "New body"
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from posts.models import Post
+
+POST_LIST_URL = '/api/post/'
+POST_DETAIL_URL = lambda pk: f"/api/post/{pk}/"
+
+
+def make_post(user, title="Sparse"):
+    return Post.objects.create(
+        author=user, title=title, content="<p>" + "long body " * 500 + "</p>",
+        team_access="read", authenticated_access="read", public_access="read",
+    )
+
+
+def post_selects(ctx):
+    return [q["sql"] for q in ctx.captured_queries if 'FROM "posts_post"' in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_list_returns_only_requested_fields_and_columns(auth_client):
+    client, user = auth_client()
+    make_post(user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(POST_LIST_URL + "?fields=id,title,excerpt")
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data["results"][0]) == {"id", "title", "excerpt"}
+
+    # page, then the posts missing from the fragment cache
+    page_sql, fragments_sql = post_selects(ctx)
+    for sql in (page_sql, fragments_sql):
+        assert "posts_postbody" not in sql
+        assert "users_user" not in sql
+        assert "likes_like" not in sql
+
+
+@pytest.mark.django_db
+def test_list_fields_keeps_author_and_viewer_state_when_requested(auth_client):
+    client, user = auth_client()
+    make_post(user)
+
+    response = client.get(POST_LIST_URL + "?fields=title,author,liked_by_me,my_access")
+    item = response.data["results"][0]
+    assert set(item) == {"title", "author", "liked_by_me", "my_access"}
+    assert item["author"]["email"] == user.email
+    assert item["my_access"] == "write"
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_works_with_sparse_fields(auth_client):
+    client, user = auth_client()
+    for i in range(15):
+        make_post(user, title=f"Post {i}")
+
+    first = client.get(POST_LIST_URL + "?fields=title")
+    second = client.get(first.data["next"])
+    titles = [p["title"] for p in first.data["results"] + second.data["results"]]
+    assert len(set(titles)) == 15
+
+
+@pytest.mark.django_db
+def test_detail_returns_only_requested_fields(auth_client):
+    client, user = auth_client()
+    post = make_post(user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(POST_DETAIL_URL(post.id) + "?fields=title,update_at")
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data) == {"title", "update_at"}
+    freshness_sql, sql = post_selects(ctx)
+    assert '"posts_post"."content"' not in sql
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fields", ["content", "title,content", "author,content"])
+def test_detail_fields_with_content(client, create_user, fields):
+    post = make_post(create_user())
+
+    response = client.get(POST_DETAIL_URL(post.id) + f"?fields={fields}")
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data) == set(fields.split(","))
+    assert response.data["content"] == post.content
+
+
+@pytest.mark.django_db
+def test_detail_fields_still_checks_permissions(auth_client):
+    _, author = auth_client(email="author@example.com")
+    other_client, _ = auth_client(email="other@example.com")
+    post = Post.objects.create(author=author, title="Private", content="...")
+
+    response = other_client.get(POST_DETAIL_URL(post.id) + "?fields=title")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fields", ["password", "title,nope", ","])
+def test_invalid_fields_are_rejected(auth_client, fields):
+    client, _ = auth_client()
+    response = client.get(POST_LIST_URL + f"?fields={fields}")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "fields" in response.data
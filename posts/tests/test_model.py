@@ -1,6 +1,10 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.core.exceptions import ValidationError
-from posts.models import Post
+from posts.models import Post, PostBody
+from users.models import Team
+from posts.permissions import READ_TIER_AUTHOR, READ_TIER_TEAM, READ_TIER_AUTHENTICATED, READ_TIER_PUBLIC
 
 @pytest.mark.django_db
 def test_excerpt_is_generated(create_user):
@@ -103,4 +107,105 @@ def test_update_at_changes_on_update(create_user):
     post.refresh_from_db()
 
     assert post.title == "Updated Title"
-    assert post.update_at > old_update_at 
\ No newline at end of file
+    assert post.update_at > old_update_at 
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("team_access, authenticated_access, public_access, expected", [
+    ("read", "read", "read", READ_TIER_PUBLIC),
+    ("write", "read", "none", READ_TIER_AUTHENTICATED),
+    ("read", "none", "none", READ_TIER_TEAM),
+    ("none", "none", "none", READ_TIER_AUTHOR),
+])
+def test_read_tier_follows_access_columns(create_user, team_access, authenticated_access, public_access, expected):
+    user = create_user()
+    post = Post.objects.create(
+        author=user,
+        title="Tier",
+        content="...",
+        team_access=team_access,
+        authenticated_access=authenticated_access,
+        public_access=public_access,
+    )
+    assert post.read_tier == expected
+
+    post.public_access = "read"
+    post.authenticated_access = "read"
+    post.team_access = "read"
+    post.save()
+    post.refresh_from_db()
+    assert post.read_tier == READ_TIER_PUBLIC
+
+
+@pytest.mark.django_db
+def test_author_team_is_copied_from_author(create_user):
+    team = Team.objects.create(name="Team A")
+    user = create_user(team=team)
+    post = Post.objects.create(author=user, title="Team", content="...")
+    assert post.author_team_id == team.id
+
+    # Without a cached author instance the team is looked up by id
+    post2 = Post.objects.create(author_id=user.id, title="Team 2", content="...")
+    assert post2.author_team_id == team.id
+
+
+@pytest.mark.django_db
+def test_author_team_follows_user_team_change(create_user):
+    team_a = Team.objects.create(name="Team A")
+    team_b = Team.objects.create(name="Team B")
+    user = create_user(team=team_a)
+    other = create_user(team=team_a)
+    posts = [Post.objects.create(author=user, title=f"P{i}", content="...") for i in range(3)]
+    other_post = Post.objects.create(author=other, title="Other", content="...")
+
+    user.team = team_b
+    user.save()
+
+    assert set(Post.objects.filter(id__in=[p.id for p in posts]).values_list('author_team_id', flat=True)) == {team_b.id}
+    other_post.refresh_from_db()
+    assert other_post.author_team_id == team_a.id
+
+    user.team = None
+    user.save(update_fields=['team'])
+    assert set(Post.objects.filter(author=user).values_list('author_team_id', flat=True)) == {None}
+
+
+@pytest.mark.django_db
+def test_content_is_stored_in_post_body(create_user):
+    user = create_user()
+    post = Post.objects.create(author=user, title="Body", content="<p>Hello body</p>")
+
+    assert PostBody.objects.get(post=post).content == "<p>Hello body</p>"
+    assert Post.objects.get(pk=post.pk).content == "<p>Hello body</p>"
+    assert post.excerpt == "Hello body"
+
+
+@pytest.mark.django_db
+def test_content_update_rewrites_body_and_excerpt(create_user):
+    user = create_user()
+    post = Post.objects.create(author=user, title="Body", content="Old")
+
+    post = Post.objects.select_related('body').get(pk=post.pk)
+    post.content = "New content"
+    post.save()
+
+    assert PostBody.objects.get(post=post).content == "New content"
+    post.refresh_from_db()
+    assert post.content == "New content"
+    assert post.excerpt == "New content"
+
+
+@pytest.mark.django_db
+def test_saving_without_content_change_does_not_touch_body(create_user, django_assert_num_queries):
+    user = create_user()
+    post = Post.objects.create(author=user, title="Body", content="Same")
+    post = Post.objects.select_related('body').get(pk=post.pk)
+
+    post.title = "Renamed"
+    with CaptureQueriesContext(connection) as ctx:
+        post.save()
+    assert not any("posts_postbody" in q["sql"] for q in ctx.captured_queries)
+
+    # nothing indexed changed: a single UPDATE
+    post.excerpt = "Other"
+    with django_assert_num_queries(1):
+        post.save()
@@ -0,0 +1,149 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from posts.models import Post
+
+POST_LIST_URL = '/api/post/'
+
+
+def make_posts(user, count, prefix="Post"):
+    return [
+        Post.objects.create(
+            author=user,
+            title=f"{prefix} {i}",
+            content="Content",
+            author_access="write",
+            team_access="read",
+            authenticated_access="read",
+            public_access="read",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_is_default(auth_client):
+    client, user = auth_client()
+    make_posts(user, 15)
+
+    response = client.get(POST_LIST_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 10
+    assert "total_count" not in response.data
+    assert "cursor=" in response.data["next"]
+    assert response.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_posts_in_order(auth_client):
+    client, user = auth_client()
+    posts = make_posts(user, 25)
+    expected = [p.id for p in sorted(posts, key=lambda p: (p.created_at, p.id), reverse=True)]
+
+    seen = []
+    url = POST_LIST_URL
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_previous_link_returns_same_page(auth_client):
+    client, user = auth_client()
+    make_posts(user, 25)
+
+    first = client.get(POST_LIST_URL)
+    second = client.get(first.data["next"])
+    back = client.get(second.data["previous"])
+
+    assert [p["id"] for p in back.data["results"]] == [p["id"] for p in first.data["results"]]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("previous", [False, True])
+def test_cursor_filter_bounds_the_index_range(client, create_user, previous):
+    make_posts(create_user(), 25)
+    url = client.get(POST_LIST_URL).data["next"]
+    if previous:
+        url = client.get(url).data["previous"]
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == status.HTTP_200_OK
+    page_sql = next(q["sql"] for q in queries if "LIMIT 11" in q["sql"])
+    # an inclusive bound next to the (created_at, id) OR, so the index scan starts at the cursor
+    assert ('"created_at" >= ' if previous else '"created_at" <= ') in page_sql
+
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + page_sql.replace("%", "%%"))
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        assert "created_at" in plan and ("<?" in plan or ">?" in plan), plan
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_is_stable_under_inserts(auth_client):
+    client, user = auth_client()
+    make_posts(user, 15)
+
+    first = client.get(POST_LIST_URL)
+    make_posts(user, 5, prefix="Newer")
+    second = client.get(first.data["next"])
+
+    first_ids = {p["id"] for p in first.data["results"]}
+    second_ids = [p["id"] for p in second.data["results"]]
+    assert len(second_ids) == 5
+    assert not first_ids & set(second_ids)
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(auth_client):
+    client, _ = auth_client()
+    response = client.get(POST_LIST_URL + "?cursor=not-a-cursor")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_available_via_query_param(auth_client):
+    client, user = auth_client()
+    make_posts(user, 15)
+
+    response = client.get(POST_LIST_URL + "?pagination=page&page=2")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["current_page"] == 2
+    assert response.data["total_count"] == 15
+    assert len(response.data["results"]) == 5
+
+
+@pytest.mark.django_db
+def test_ordering_by_likes_count(auth_client):
+    client, user = auth_client()
+    posts = make_posts(user, 12)
+    for likes, post in zip([3, 0, 7, 1, 5, 0, 2, 9, 4, 0, 6, 8], posts):
+        Post.objects.filter(pk=post.pk).update(likes_count=likes)
+
+    seen = []
+    url = POST_LIST_URL + "?ordering=-likes_count"
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(item["likes_count"] for item in response.data["results"])
+        url = response.data["next"]
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == 12
+
+    response = client.get(POST_LIST_URL + "?ordering=-likes_count&pagination=page")
+    assert response.data["results"][0]["likes_count"] == 9
+
+
+@pytest.mark.django_db
+def test_invalid_ordering_is_rejected(auth_client):
+    client, _ = auth_client()
+    response = client.get(POST_LIST_URL + "?ordering=content")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "ordering" in response.data
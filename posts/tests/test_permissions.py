@@ -3,6 +3,11 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from users.models import Team
 from posts.models import Post
+from django.contrib.auth.models import AnonymousUser
+from posts.permissions import (
+    get_readable_posts_query, get_user_permission_level, get_permission_level_expression,
+    get_permission_level_from_values, get_permission_levels, PERMISSION_VALUE_FIELDS,
+)
 
 POST_LIST_URL = '/api/post/'
 POST_DETAIL_URL = lambda pk: f"/api/post/{pk}/"
@@ -83,7 +88,7 @@ def test_pagination_on_post_list(auth_client):
             public_access="read",
         )
 
-    response = client.get(POST_LIST_URL)
+    response = client.get(POST_LIST_URL + "?pagination=page")
     assert response.status_code == status.HTTP_200_OK
     assert response.data["total_count"] == 15
     assert len(response.data["results"]) == 10
@@ -313,4 +318,131 @@ def test_invalid_choice_to_public(auth_client):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     assert "public_access" in response.data
-    assert '"write" is not a valid choice.' in str(response.data["public_access"])
\ No newline at end of file
+    assert '"write" is not a valid choice.' in str(response.data["public_access"])
+
+@pytest.mark.django_db
+def test_post_list_visibility_per_viewer(auth_client, client):
+    team = Team.objects.create(name="Team A")
+    author_client, author = auth_client(email="author@example.com", team=team)
+    profiles = {
+        "public": ("read", "read", "read"),
+        "authenticated": ("read", "read", "none"),
+        "team": ("read", "none", "none"),
+        "private": ("none", "none", "none"),
+    }
+    for title, (team_access, authenticated_access, public_access) in profiles.items():
+        Post.objects.create(
+            author=author,
+            title=title,
+            content="...",
+            team_access=team_access,
+            authenticated_access=authenticated_access,
+            public_access=public_access,
+        )
+
+    def titles(c):
+        response = c.get(POST_LIST_URL)
+        assert response.status_code == status.HTTP_200_OK
+        return {p["title"] for p in response.data["results"]}
+
+    mate_client, _ = auth_client(email="mate@example.com", team=team)
+    outsider_client, _ = auth_client(email="outsider@example.com", team=Team.objects.create(name="Team B"))
+
+    assert titles(client) == {"public"}
+    assert titles(outsider_client) == {"public", "authenticated"}
+    assert titles(mate_client) == {"public", "authenticated", "team"}
+    assert titles(author_client) == {"public", "authenticated", "team", "private"}
+
+
+@pytest.mark.django_db
+def test_team_visibility_does_not_touch_users_table(auth_client, django_assert_num_queries):
+    team = Team.objects.create(name="Team A")
+    _, author = auth_client(email="author@example.com", team=team)
+    _, mate = auth_client(email="mate@example.com", team=team)
+    post = Post.objects.create(
+        author=author, title="Team Post", content="...",
+        team_access="read", authenticated_access="none", public_access="none",
+    )
+
+    query = str(Post.objects.filter(get_readable_posts_query(mate)).query)
+    assert "users_user" not in query
+
+    post = Post.objects.get(id=post.id)
+    with django_assert_num_queries(0):
+        assert get_user_permission_level(mate, post) == "read"
+
+
+@pytest.mark.django_db
+def test_permission_levels_from_values_match_model_check(create_user, django_assert_num_queries):
+    team = Team.objects.create(name="Team A")
+    author = create_user(team=team)
+    mate = create_user(team=team)
+    outsider = create_user()
+    admin = create_user()
+    admin.role = "admin"
+    for team_access, authenticated_access, public_access in [
+        ("write", "read", "read"), ("read", "read", "none"), ("write", "none", "none"), ("none", "none", "none"),
+    ]:
+        Post.objects.create(
+            author=author, title="Levels", content="...",
+            team_access=team_access, authenticated_access=authenticated_access, public_access=public_access,
+        )
+
+    posts = list(Post.objects.order_by("id"))
+    rows = list(Post.objects.order_by("id").values_list(*PERMISSION_VALUE_FIELDS))
+
+    for viewer in (AnonymousUser(), author, mate, outsider, admin):
+        expected = [get_user_permission_level(viewer, post) for post in posts]
+        with django_assert_num_queries(0):
+            assert [get_permission_level_from_values(viewer, *row) for row in rows] == expected
+            assert get_permission_levels(viewer, rows) == expected
+    assert get_permission_levels(mate, rows) == ["write", "read", "write", "none"]
+
+
+@pytest.mark.django_db
+def test_post_list_reports_viewer_state(auth_client, client):
+    from likes.models import Like
+
+    team = Team.objects.create(name="Team A")
+    author_client, author = auth_client(email="author@example.com", team=team)
+    mate_client, mate = auth_client(email="mate@example.com", team=team)
+    outsider_client, _ = auth_client(email="outsider@example.com", team=Team.objects.create(name="Team B"))
+    admin_client, admin = auth_client(email="admin@example.com")
+    admin.role = "admin"
+    admin.save()
+
+    post = Post.objects.create(
+        author=author, title="State", content="...",
+        team_access="write", authenticated_access="read", public_access="read",
+    )
+    Like.objects.add_like(mate, post)
+
+    def state(c):
+        item = c.get(POST_LIST_URL).data["results"][0]
+        return item["liked_by_me"], item["my_access"]
+
+    assert state(client) == (False, "read")
+    assert state(author_client) == (False, "write")
+    assert state(mate_client) == (True, "write")
+    assert state(outsider_client) == (False, "read")
+    assert state(admin_client) == (False, "write")
+
+    # The SQL annotation agrees with the Python permission check
+    for user in (author, mate, admin):
+        annotated = Post.objects.annotate(level=get_permission_level_expression(user)).get(pk=post.pk)
+        assert annotated.level == get_user_permission_level(user, post)
+
+
+@pytest.mark.django_db
+def test_create_and_update_responses_include_viewer_state(auth_client):
+    client, user = auth_client()
+    response = client.post(POST_LIST_URL, {
+        "title": "Mine", "content": "...",
+        "team_access": "read", "authenticated_access": "none", "public_access": "none",
+    }, format="json")
+    assert response.data["liked_by_me"] is False
+    assert response.data["my_access"] == "write"
+
+    response = client.patch(f"/api/blog/{response.data['id']}/", {"title": "Still mine"}, format="json")
+    assert response.data["liked_by_me"] is False
+    assert response.data["my_access"] == "write"
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from posts.models import Post
+from users.models import Team, User
+
+POST_LIST_URL = '/api/post/'
+POST_DETAIL_URL = lambda pk: f"/api/post/{pk}/"
+POST_UPDATE_URL = lambda pk: f"/api/blog/{pk}/"
+
+
+def make_public_posts(count):
+    # Every post gets its own author and team, so any lazy load shows up as an extra query
+    posts = []
+    for _ in range(count):
+        index = User.objects.count()
+        team = Team.objects.create(name=f"Query Team {index}")
+        author = User.objects.create_user(email=f"author{index}@example.com", username=f"author{index}", team=team)
+        posts.append(Post.objects.create(
+            author=author, title=f"Post {index}", content="Content",
+            team_access="read", authenticated_access="read", public_access="read",
+        ))
+    return posts
+
+
+def count_queries(client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(client, method)(url, **kwargs)
+    assert response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED), response.data
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("authenticated", [False, True])
+def test_post_list_query_count_is_constant(auth_client, authenticated):
+    client = auth_client()[0] if authenticated else APIClient()
+    auth_queries = 1 if authenticated else 0  # token lookup
+
+    make_public_posts(2)
+    small_page = count_queries(client, "get", POST_LIST_URL)
+    make_public_posts(8)
+    full_page = count_queries(client, "get", POST_LIST_URL)
+
+    # page + the posts missing from the fragment cache (all of them here)
+    assert small_page == full_page == auth_queries + 2
+
+
+@pytest.mark.django_db
+def test_post_list_page_number_query_count_is_constant(client):
+    make_public_posts(2)
+    small_page = count_queries(client, "get", POST_LIST_URL + "?pagination=page")
+    make_public_posts(8)
+    full_page = count_queries(client, "get", POST_LIST_URL + "?pagination=page")
+
+    assert small_page == full_page == 3  # COUNT(*) + page + fragment misses
+
+
+@pytest.mark.django_db
+def test_post_detail_query_count(client):
+    post = make_public_posts(1)[0]
+    # freshness check (ETag) + post
+    assert count_queries(client, "get", POST_DETAIL_URL(post.id)) == 2
+
+
+@pytest.mark.django_db
+def test_post_create_response_query_count(auth_client):
+    client, _ = auth_client()
+    payload = {
+        "title": "Counted", "content": "Content",
+        "team_access": "read", "authenticated_access": "read", "public_access": "read",
+    }
+    # token lookup, post, body and search index INSERTs inside a savepoint, author's team for the nested response
+    assert count_queries(client, "post", POST_LIST_URL, data=payload, format="json") == 7
+
+
+@pytest.mark.django_db
+def test_post_update_response_query_count(auth_client):
+    client, user = auth_client()
+    post = Post.objects.create(author=user, title="Counted", content="Content")
+
+    # token lookup, post with author and team, UPDATE and search index title UPDATE inside a savepoint
+    assert count_queries(client, "patch", POST_UPDATE_URL(post.id), data={"title": "Changed"}, format="json") == 6
@@ -0,0 +1,125 @@
+import pytest
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+from posts import related
+from posts.models import Post, RelatedPost
+
+RELATED_URL = lambda pk: f'/api/post/{pk}/related/'
+
+CORPUS = [
+    ("Gardening basics", "Soil, water, seeds and compost for a spring garden."),
+    ("Spring garden planning", "Plan the seeds, compost and soil before spring."),
+    ("Compost for beginners", "Garden compost from kitchen scraps keeps the soil healthy."),
+    ("Django caching", "Cache views and querysets in Django."),
+    ("Django query optimization", "Fewer queries in Django views with select_related."),
+    ("Sourdough bread", "Flour, salt and patience."),
+]
+
+
+def make_post(author, title, content="<p>Body</p>", public=True):
+    access = "read" if public else "none"
+    return Post.objects.create(
+        author=author, title=title, content=content,
+        team_access="read", authenticated_access="read", public_access=access,
+    )
+
+
+def related_titles(client, post):
+    response = client.get(RELATED_URL(post.pk))
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return [row["title"] for row in response.data]
+
+
+@pytest.mark.django_db
+def test_related_posts_readable_and_ranked(client, auth_client, create_user):
+    author = create_user()
+    post = make_post(author, "Gardening basics")
+    first = make_post(author, "Compost for beginners")
+    hidden = make_post(author, "Private garden notes", public=False)
+    second = make_post(author, "Spring garden planning")
+    RelatedPost.objects.bulk_create([
+        RelatedPost(post=post, related=first, rank=0, score=0.8),
+        RelatedPost(post=post, related=hidden, rank=1, score=0.6),
+        RelatedPost(post=post, related=second, rank=2, score=0.4),
+    ])
+
+    response = client.get(RELATED_URL(post.pk))
+    assert response.status_code == status.HTTP_200_OK
+    assert [(row["id"], row["score"]) for row in response.data] == [(first.pk, 0.8), (second.pk, 0.4)]
+    assert response.data[0]["author"]["id"] == author.id
+
+    user_client, _ = auth_client()
+    assert related_titles(user_client, post) == ["Compost for beginners", "Private garden notes", "Spring garden planning"]
+
+
+@pytest.mark.django_db
+def test_related_posts_of_unreadable_post_not_found(client, create_user):
+    post = make_post(create_user(), "Private", public=False)
+    assert client.get(RELATED_URL(post.pk)).status_code == status.HTTP_404_NOT_FOUND
+    assert client.get(RELATED_URL(post.pk + 1)).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_build_requires_numpy():
+    with mock.patch.object(related, "np", None):
+        with pytest.raises(CommandError):
+            call_command("build_related_posts", stdout=StringIO())
+
+
+@pytest.fixture
+def corpus(create_user):
+    pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+    author = create_user()
+    return {title: make_post(author, title, f"<p>{text}</p>") for title, text in CORPUS}
+
+
+@pytest.mark.django_db
+def test_build_finds_similar_posts(client, corpus):
+    assert related.refresh() == (len(CORPUS), len(CORPUS))
+
+    gardening = related_titles(client, corpus["Gardening basics"])
+    assert set(gardening[:2]) == {"Spring garden planning", "Compost for beginners"}
+    assert not {"Django caching", "Django query optimization"} & set(gardening)
+    assert related_titles(client, corpus["Django caching"])[0] == "Django query optimization"
+    # nothing in common with the others
+    assert related_titles(client, corpus["Sourdough bread"]) == []
+    assert not RelatedPost.objects.filter(post=corpus["Sourdough bread"]).exists()
+
+
+@pytest.mark.django_db
+def test_refresh_only_recomputes_changed_and_affected_posts(client, corpus, create_user):
+    related.refresh()
+    assert related.refresh() == (0, len(CORPUS))
+
+    # a new post about Django enters the lists of the Django posts only
+    post = make_post(create_user(), "Django caching tips", "<p>Cache querysets in Django views.</p>")
+    # the new post and the two Django posts
+    assert related.refresh() == (3, len(CORPUS) + 1)
+    assert "Django caching tips" in related_titles(client, corpus["Django caching"])
+    assert "Django caching" in related_titles(client, post)
+
+    # leaving a list also recomputes it
+    post.title = "Sourdough starter"
+    post.content = "<p>Flour and patience.</p>"
+    post.save()
+    related.refresh()
+    assert "Sourdough starter" not in related_titles(client, corpus["Django caching"])
+    assert related_titles(client, corpus["Sourdough bread"]) == ["Sourdough starter"]
+
+
+def test_batches_are_bounded_by_similarity_entries():
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+    rows = np.arange(5)
+    bounds = np.array([4, 4, 4, 10, 1])
+
+    batches = related.iter_batches(rows, bounds, batch_size=10, max_entries=8)
+    # a single post over the limit still gets a batch of its own
+    assert [batch.tolist() for batch in batches] == [[0, 1], [2], [3], [4]]
+    batches = related.iter_batches(rows, bounds, batch_size=2, max_entries=100)
+    assert [batch.tolist() for batch in batches] == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,133 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from rest_framework import status
+from posts import search
+from posts.management.seed import seed_posts
+from posts.models import Post
+
+SEARCH_URL = '/api/post/search/'
+POST_UPDATE_URL = lambda pk: f'/api/blog/{pk}/'
+
+
+def make_post(author, title, content, public=True):
+    access = "read" if public else "none"
+    return Post.objects.create(
+        author=author, title=title, content=content,
+        team_access="read", authenticated_access="read", public_access=access,
+    )
+
+
+def search_titles(client, q, **params):
+    response = client.get(SEARCH_URL, {"q": q, **params})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return [row["title"] for row in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_search_matches_title_and_body_ranked(client, create_user):
+    author = create_user()
+    make_post(author, "Gardening basics", "<p>Soil, water and patience.</p>")
+    make_post(author, "Weekend notes", "<p>Some <strong>gardening</strong> tips for spring.</p>")
+    make_post(author, "Cooking", "<p>Nothing about plants.</p>")
+
+    assert search_titles(client, "gardening") == ["Gardening basics", "Weekend notes"]
+    assert search_titles(client, "spring gardening") == ["Weekend notes"]
+    # stemming, and markup is not indexed
+    assert search_titles(client, "tip") == ["Weekend notes"]
+    assert search_titles(client, "strong") == []
+
+
+@pytest.mark.django_db
+def test_search_respects_read_permissions(client, auth_client, create_user):
+    author_client, author = auth_client()
+    make_post(author, "Public launch", "Launch day")
+    make_post(author, "Private launch", "Launch plans", public=False)
+
+    assert search_titles(client, "launch") == ["Public launch"]
+    assert sorted(search_titles(author_client, "launch")) == ["Private launch", "Public launch"]
+
+
+@pytest.mark.django_db
+def test_index_follows_edits_and_deletes(auth_client):
+    client, author = auth_client()
+    post = make_post(author, "Old title", "<p>Original body</p>")
+
+    client.patch(POST_UPDATE_URL(post.id), {"title": "Fresh title"}, format="json")
+    assert search_titles(client, "fresh") == ["Fresh title"]
+    assert search_titles(client, "old") == []
+    assert search_titles(client, "original") == ["Fresh title"]
+
+    client.patch(POST_UPDATE_URL(post.id), {"content": "<p>Rewritten body</p>"}, format="json")
+    assert search_titles(client, "rewritten") == ["Fresh title"]
+    assert search_titles(client, "original") == []
+
+    Post.objects.get(pk=post.pk).delete()
+    assert search_titles(client, "fresh") == []
+
+
+def search_rows():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {search.SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_index_rows_go_with_posts_deleted_with_their_author(create_user):
+    if not search.is_supported():
+        pytest.skip("no search table on this database")
+    author = create_user()
+    make_post(author, "First", "<p>One</p>")
+    make_post(author, "Second", "<p>Two</p>")
+    assert search_rows() == 2
+
+    author.delete()
+    assert search_rows() == 0
+
+
+@pytest.mark.django_db
+def test_index_table_does_not_block_truncating_posts():
+    # flush truncates model tables only; PostgreSQL rejects that while another table references posts_post
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, search.SEARCH_TABLE) if search.is_supported() else {}
+    assert not [name for name, constraint in constraints.items() if constraint["foreign_key"]]
+
+
+@pytest.mark.django_db
+def test_search_is_page_paginated_with_fields(client, create_user):
+    author = create_user()
+    for i in range(12):
+        make_post(author, f"Python tip {i}", "<p>Python</p>")
+
+    response = client.get(SEARCH_URL, {"q": "python", "fields": "id,title", "page": 2})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["total_count"] == 12
+    assert response.data["current_page"] == 2
+    assert len(response.data["results"]) == 2
+    assert set(response.data["results"][0]) == {"id", "title"}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("q", ['"unbalanced', "python OR", "NEAR(python", "title:python", "python*"])
+def test_search_operators_are_taken_literally(client, create_user, q):
+    make_post(create_user(), "Python", "Python")
+    assert search_titles(client, q) in (["Python"], [])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"q": ""}, {"q": " ?! "}, {"q": "x" * 201}])
+def test_invalid_search_query(client, params):
+    response = client.get(SEARCH_URL, params)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "q" in response.data
+
+
+@pytest.mark.django_db
+def test_rebuild_indexes_bulk_inserted_posts(client):
+    seed_posts(5, teams=1, users=2)
+    assert search_titles(client, "benchmark") == []
+
+    call_command("rebuild_search_index", stdout=StringIO())
+    assert len(search_titles(client, "benchmark")) == Post.objects.filter(public_access="read").count()
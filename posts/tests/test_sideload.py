@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from posts.models import Post
+from posts.views import PostListCreateView
+from users.models import Team, User
+
+POST_LIST_URL = '/api/post/'
+
+
+@pytest.fixture
+def authors(create_user):
+    team = Team.objects.create(name="Team A")
+    prolific = create_user(team=team)
+    occasional = User.objects.create_user(email="occasional@example.com", username="occasional", password="x")
+    User.objects.filter(pk=occasional.pk).update(team=None)
+    for i in range(8):
+        author = occasional if i == 3 else prolific
+        Post.objects.create(
+            author=author, title=f"Post {i}", content="...",
+            team_access="read", authenticated_access="read", public_access="read",
+        )
+    return prolific, occasional
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compiled", [True, False])
+def test_include_users_sideloads_each_author_once(monkeypatch, client, authors, compiled):
+    monkeypatch.setattr(PostListCreateView, "use_compiled_serializer", compiled)
+    prolific, occasional = authors
+
+    response = client.get(POST_LIST_URL + "?include=users")
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.data["results"]
+    assert all("author" not in row for row in results)
+    assert sorted({row["author_id"] for row in results}) == [prolific.id, occasional.id]
+
+    users = response.data["included"]["users"]
+    assert set(users) == {str(prolific.id), str(occasional.id)}
+    assert users[str(prolific.id)] == {
+        "id": prolific.id, "username": prolific.username, "email": prolific.email,
+        "role": prolific.role, "team": {"id": prolific.team.id, "name": "Team A"},
+    }
+    assert users[str(occasional.id)]["team"] is None
+
+
+@pytest.mark.django_db
+def test_include_users_adds_one_query_without_author_join(client, authors):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(POST_LIST_URL + "?include=users")
+    assert response.status_code == status.HTTP_200_OK
+
+    page_query, fragments_query, users_query = [q["sql"] for q in ctx.captured_queries]
+    assert "users_user" not in page_query
+    assert "users_user" not in fragments_query
+    assert 'FROM "users_user"' in users_query
+
+
+@pytest.mark.django_db
+def test_include_users_respects_sparse_fields(client, authors):
+    response = client.get(POST_LIST_URL + "?include=users&fields=id,title")
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data["results"][0]) == {"id", "title"}
+    assert response.data["included"] == {"users": {}}
+
+
+@pytest.mark.django_db
+def test_unknown_include_is_rejected(client):
+    response = client.get(POST_LIST_URL + "?include=teams")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "include" in response.data
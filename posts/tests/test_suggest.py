@@ -0,0 +1,125 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from posts import suggest
+from posts.models import Post
+
+SUGGEST_URL = '/api/post/suggest/'
+
+
+def make_post(author, title, public=True):
+    access = "read" if public else "none"
+    return Post.objects.create(
+        author=author, title=title, content="<p>Body</p>",
+        team_access="read", authenticated_access="read", public_access=access,
+    )
+
+
+def suggest_titles(client, q, **params):
+    response = client.get(SUGGEST_URL, {"q": q, **params})
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return [row["title"] for row in response.data]
+
+
+@pytest.mark.django_db
+def test_prefix_matches_first_then_word_prefixes(client, create_user):
+    author = create_user()
+    make_post(author, "Gardening basics")
+    make_post(author, "garden tools")
+    make_post(author, "Winter garden plans")
+    make_post(author, "Cooking")
+
+    assert suggest_titles(client, "GARD") == ["garden tools", "Gardening basics", "Winter garden plans"]
+    assert suggest_titles(client, "gard", limit=2) == ["garden tools", "Gardening basics"]
+    assert suggest_titles(client, "win gar") == ["Winter garden plans"]
+    assert suggest_titles(client, "plan") == ["Winter garden plans"]
+    assert suggest_titles(client, "zz") == []
+
+
+@pytest.mark.django_db
+def test_only_readable_titles_per_viewer(client, auth_client, create_user):
+    author = create_user()
+    make_post(author, "Public draft")
+    make_post(author, "Private draft", public=False)
+
+    assert suggest_titles(client, "pri") == []
+    # the anonymous result is cached, the logged in user gets their own
+    user_client, _ = auth_client()
+    assert suggest_titles(user_client, "pri") == ["Private draft"]
+    assert suggest_titles(client, "pri") == []
+
+
+@pytest.mark.django_db
+def test_hot_prefixes_are_served_from_memory(client, create_user):
+    author = create_user()
+    post = make_post(author, "Caching tips")
+
+    assert suggest_titles(client, "cach") == ["Caching tips"]
+    with CaptureQueriesContext(connection) as queries:
+        assert suggest_titles(client, "Cach") == ["Caching tips"]
+    assert len(queries) == 0
+
+    post.title = "Queueing tips"
+    post.save()
+    assert suggest_titles(client, "cach") == []
+
+
+@pytest.mark.django_db
+def test_cached_prefixes_fold_case_like_the_database(client, create_user):
+    author = create_user()
+    make_post(author, "Élan vital")
+    make_post(author, "élan")
+    expected = {}
+    for q in ("É", "é"):
+        suggest.suggestions.clear()
+        expected[q] = suggest_titles(client, q)
+
+    suggest.suggestions.clear()
+    assert {q: suggest_titles(client, q) for q in ("É", "é")} == expected
+
+
+@pytest.mark.django_db
+def test_non_ascii_prefixes_match(create_user):
+    author = create_user()
+    post = make_post(author, "Élan vital")
+    make_post(author, "Elan")
+    queryset = Post.objects.all()
+
+    assert [p.pk for p in suggest.prefix_matches(queryset, "Él")] == [post.pk]
+    assert [p.pk for p in suggest.prefix_matches(queryset, "ÉLAN V")] == [post.pk]
+
+
+@pytest.mark.django_db
+def test_highest_code_point_prefix(client, create_user):
+    make_post(create_user(), "\U0010ffff last")
+
+    assert suggest_titles(client, "\U0010ffff") == ["\U0010ffff last"]
+    assert suggest.prefix_upper_bound("a\U0010ffff") == "b"
+    assert suggest.prefix_upper_bound("\U0010ffff") is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"q": "  "}, {"q": "x" * 101}, {"q": "a", "limit": 0}, {"q": "a", "limit": "ten"}])
+def test_invalid_parameters(client, params):
+    response = client.get(SUGGEST_URL, params)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_ttl_lru_cache_evicts_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(suggest.time, "monotonic", lambda: now[0])
+    lru = suggest.TTLLRUCache(maxsize=2, ttl=10)
+
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    # "b" was least recently used
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+
+    now[0] += 10
+    assert lru.get("a") is None
+    assert lru.get("c") is None
+    assert len(lru) == 0
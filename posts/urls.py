@@ -1,10 +1,14 @@
 from django.urls import path
-from .views import PostListCreateView, PostUpdateView, PostDetailView, PostDeleteView
+from .views import PostListCreateView, PostUpdateView, PostDetailView, PostDeleteView, PostCacheStatsView, PostSearchView, PostSuggestView, PostRelatedView
 
 
 urlpatterns = [
     path('post/', PostListCreateView.as_view(), name='post-list-create'),
+    path('post/search/', PostSearchView.as_view(), name='post-search'),
+    path('post/suggest/', PostSuggestView.as_view(), name='post-suggest'),
     path('blog/<int:pk>/', PostUpdateView.as_view(), name='post-update'),
     path('post/<int:pk>/', PostDetailView.as_view(), name='post-detail'),
-    path('post/<int:pk>/delete/', PostDeleteView.as_view(), name='delete-post')
+    path('post/<int:pk>/related/', PostRelatedView.as_view(), name='post-related'),
+    path('post/<int:pk>/delete/', PostDeleteView.as_view(), name='delete-post'),
+    path('post/cache-stats/', PostCacheStatsView.as_view(), name='post-cache-stats'),
 ]
\ No newline at end of file
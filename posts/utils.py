@@ -0,0 +1,87 @@
+import re
+
+from django.utils.html import MLStripper, strip_tags
+
+EXCERPT_LENGTH = 200
+# How much HTML is handed to the parser before checking if there is enough text
+EXCERPT_CHUNK_SIZE = 4096
+# "&#" without a valid character reference; HTMLParser handles these based on
+# what is left in its buffer, so the result would depend on the chunk size
+INVALID_CHARREF_RE = re.compile(r'&#(?![0-9]+[^0-9a-fA-F]|[xX][0-9a-fA-F]+[^0-9a-fA-F])')
+# Character references and the character that ends them. Chunks never end
+# inside one, so the result doesn't depend on how HTMLParser buffers (or
+# doesn't) a reference that is cut in two
+REFERENCE_RE = re.compile(r'(?:&[^\t\n\f <&;]*)+[\s\S]?')
+
+
+def truncate_excerpt(text, length=EXCERPT_LENGTH):
+    """
+    Cut whitespace normalized text to `length` characters on a word boundary
+    and mark it with "..."
+    """
+    if len(text) > length:
+        cut = text[:length]
+        cut = cut.rsplit(' ', 1)[0] if ' ' in cut else cut
+        return f"{cut}..."
+    return text
+
+
+def _strip_tags_excerpt(html, length):
+    return truncate_excerpt(' '.join(strip_tags(html).split()), length)
+
+
+def _get_chunk_end(html, start, chunk_size):
+    """End of the chunk from `start`, moved past a character reference it would cut in two"""
+    end = start + chunk_size
+    reference = html.rfind('&', start, end)
+    if reference != -1:
+        end = max(end, REFERENCE_RE.match(html, reference).end())
+    return min(end, len(html))
+
+
+def build_excerpt(html, length=EXCERPT_LENGTH, chunk_size=EXCERPT_CHUNK_SIZE):
+    """
+    Same result as truncate_excerpt(' '.join(strip_tags(html).split())), but the
+    HTML is parsed in chunks and parsing stops as soon as the first `length`
+    characters of text are known, so the cost does not grow with the document.
+    """
+    html = str(html or '')
+    if '<' not in html or '>' not in html:
+        # strip_tags returns such values untouched
+        return truncate_excerpt(' '.join(html.split()), length)
+
+    parser = MLStripper()
+    end = 0
+    while end < len(html):
+        start, end = end, _get_chunk_end(html, end, chunk_size)
+        parser.feed(html[start:end])
+        data = parser.get_data()
+        if len(data) <= length:
+            continue
+
+        text = ' '.join(data.split())
+        if len(text) > length:
+            # strip_tags gives back the original value when no tag was removed,
+            # so this prefix is only final if the consumed HTML either had a tag
+            # or came through unchanged (no tags or entities).
+            consumed = end - len(parser.rawdata)
+            if (
+                '<' not in data
+                and not INVALID_CHARREF_RE.search(html, 0, consumed)
+                and (html.find('<', 0, consumed) != -1 or html.find('&', 0, consumed) == -1)
+            ):
+                return truncate_excerpt(text, length)
+            return _strip_tags_excerpt(html, length)
+
+        # Keep the buffered text short; only word boundaries matter from here on
+        parser.fed = [f'{text} ' if data[-1].isspace() else text]
+
+    parser.close()
+    value = parser.get_data()
+    if INVALID_CHARREF_RE.search(html) or ('<' in value and '>' in value):
+        # markup hidden behind other markup needs strip_tags' repeated passes
+        return _strip_tags_excerpt(html, length)
+    if value.count('<') == html.count('<'):
+        # nothing was stripped, strip_tags keeps the input as is
+        value = html
+    return truncate_excerpt(' '.join(value.split()), length)
@@ -1,16 +1,108 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.exceptions import NotFound
-from drf_spectacular.utils import extend_schema, OpenApiResponse
+from rest_framework.exceptions import NotFound, ValidationError
+from django.db.models import Exists, F, OuterRef, Value
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 
+from . import search, suggest
 from .models import Post
-from .serializers import PostSerializer, PostUpdateSerializer, PostDetailSerializer
-from .permissions import user_can_read_post, user_can_edit_post, get_readable_posts_query
-from .paginations import PostPagination
+from .serializers import PostSerializer, PostUpdateSerializer, PostDetailSerializer, RelatedPostSerializer
+from .permissions import IsAdmin, READABLE_LEVELS, PERMISSION_VALUE_FIELDS, get_permission_level_from_values, get_readable_object_or_404, user_can_edit_post, get_readable_posts_query, get_permission_level_expression, PERMISSION_FIELDS
+from likes.models import Like
+from blog_app_back.compiled_serializers import CompiledListMixin
+from blog_app_back.conditional import ConditionalGetMixin
+from users.mixins import SideloadUsersMixin, INCLUDE_PARAMETER
+from .paginations import PostPagination, PostCursorPagination
+from .cache import (
+    AnonymousResponseCacheMixin, PostFragmentCacheMixin, LIST_GENERATION, AUTHORS_GENERATION,
+    author_generation, team_generation, post_generation, get_generations, get_stats,
+)
 
 
-class PostListCreateView(generics.ListCreateAPIView):
+def annotate_viewer_state(queryset, user, liked_by_me=True, my_access=True):
+    """
+    Annotate liked_by_me (EXISTS subquery) and my_access (CASE expression)
+    so PostSerializer needs no extra query per post
+    """
+    if liked_by_me and user.is_authenticated:
+        queryset = queryset.annotate(liked_by_me=Exists(Like.objects.filter(post=OuterRef('pk'), user=user)))
+    elif liked_by_me:
+        queryset = queryset.annotate(liked_by_me=Value(False))
+
+    if my_access:
+        queryset = queryset.annotate(my_access=get_permission_level_expression(user))
+    return queryset
+
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name='fields',
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    required=False,
+    description='Comma separated subset of fields to return, e.g. `id,title,excerpt`. '
+                'Columns that are not requested are not read from the database.'
+)
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields= projection for GET requests: limits the serializer fields and
+    prunes the queryset to the matching columns with .only()
+    """
+
+    def get_requested_fields(self):
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = None
+            raw = self.request.query_params.get('fields') if self.request.method == 'GET' else None
+
+            if raw is not None:
+                requested = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+                if not requested:
+                    raise ValidationError({'fields': 'Must list at least one field'})
+                allowed = self.get_serializer_class().Meta.fields
+                unknown = [name for name in requested if name not in allowed]
+                if unknown:
+                    raise ValidationError({'fields': f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"})
+                self._requested_fields = requested
+
+        return self._requested_fields
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def wants_field(self, name):
+        fields = self.get_requested_fields()
+        return fields is None or name in fields
+
+    # serializer field -> relation that has to be joined to render it
+    related_fields = {}
+
+    def select_requested_related(self, queryset):
+        """Join only the relations the requested fields need"""
+        related = [path for name, path in self.related_fields.items() if self.wants_field(name)]
+        # a bare select_related() would follow every foreign key
+        return queryset.select_related(*related) if related else queryset
+
+    def prune_queryset(self, queryset, required=()):
+        """
+        Only load the requested model columns plus the `required` ones
+        """
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = [name for name in fields if name in concrete]
+        # a joined reverse relation (content -> body) can't be deferred
+        columns += [self.related_fields[name] for name in fields if name not in concrete and name in self.related_fields]
+        return queryset.only('id', *required, *columns)
+
+
+class PostListCreateView(AnonymousResponseCacheMixin, SideloadUsersMixin, PostFragmentCacheMixin, CompiledListMixin, SparseFieldsetMixin, generics.ListCreateAPIView):
     """
     GET -> posts list
     POST -> create a post 
@@ -19,11 +111,46 @@ class PostListCreateView(generics.ListCreateAPIView):
     queryset = Post.objects.all().order_by('-created_at')
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    pagination_class = PostPagination
+    pagination_class = PostCursorPagination
+    page_number_pagination_class = PostPagination
+    ordering_fields = ['created_at', 'likes_count']
+    default_ordering = '-created_at'
+    related_fields = {'author': 'author__team', 'content': 'body'}
+    compiled_paths = {'content': 'body__content'}
+    compiled_annotations = ('liked_by_me', 'my_access')
+    sideloaded_user_field = 'author'
 
     @extend_schema(
         operation_id='list_posts',
-        description='Get list of posts that the user has permission to read. Returns empty list if no accessible posts.',
+        description='Get list of posts that the user has permission to read. Returns empty list if no accessible posts. '
+                    'Results are cursor paginated by default; pass `pagination=page` for the legacy page-number shape.',
+        parameters=[
+            OpenApiParameter(
+                name='pagination',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                enum=['cursor', 'page'],
+                description='Pagination style: opaque cursors (default) or page numbers with total counts'
+            ),
+            OpenApiParameter(
+                name='page',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description='Page number (implies `pagination=page`)'
+            ),
+            OpenApiParameter(
+                name='ordering',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                enum=['-created_at', 'created_at', '-likes_count', 'likes_count'],
+                description='Sort order, newest first by default. `-likes_count` lists the most liked posts first'
+            ),
+            FIELDS_PARAMETER,
+            INCLUDE_PARAMETER,
+        ],
         responses={
             200: OpenApiResponse(
                 response=PostSerializer(many=True),
@@ -54,9 +181,25 @@ class PostListCreateView(generics.ListCreateAPIView):
         """Create a new post"""
         return super().post(request, *args, **kwargs)
 
+    @property
+    def paginator(self):
+        """
+        Cursor pagination by default; old clients can still ask for page numbers
+        with `?pagination=page` (or by sending `?page=`).
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'page' or 'page' in params:
+                self._paginator = self.page_number_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def perform_create(self, serializer):
         #automatically sets the author as the authenticated user
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        #nobody can have liked a post that was just created
+        post.liked_by_me = False
 
     def get_queryset(self):
         """Filter posts based on user permissions - returns empty if no accessible posts"""
@@ -64,15 +207,161 @@ class PostListCreateView(generics.ListCreateAPIView):
         user = self.request.user
 
         query = get_readable_posts_query(user)
+        ordering = self.get_ordering()
+        tiebreaker = '-id' if ordering.startswith('-') else 'id'
+
+        queryset = self.select_requested_related(Post.objects.filter(query)).order_by(ordering, tiebreaker)
+        # cursors are built from the ordering column
+        queryset = self.prune_queryset(queryset, required=[ordering.lstrip('-')])
+
+        return annotate_viewer_state(
+            queryset, user, liked_by_me=self.wants_field('liked_by_me'), my_access=self.wants_field('my_access')
+        )
 
-        return Post.objects.filter(query).order_by('-created_at')
+    def get_cache_generations(self):
+        return [LIST_GENERATION]
+
+    def get_pagination_values(self):
+        # cursors are built from the ordering column and id
+        return ['id', self.get_ordering().lstrip('-')]
+
+    def get_ordering(self):
+        """Validated `ordering` query parameter, e.g. '-likes_count'"""
+        ordering = self.request.query_params.get('ordering', self.default_ordering)
+        if ordering.lstrip('-') not in self.ordering_fields:
+            raise ValidationError({'ordering': f"Must be one of: {', '.join(self.ordering_fields)} (prefix with '-' for descending)"})
+        return ordering
     
+class PostSearchView(PostFragmentCacheMixin, CompiledListMixin, SparseFieldsetMixin, generics.ListAPIView):
+    """
+    GET -> readable posts matching ?q=, best matches first
+    """
+    serializer_class = PostSerializer
+    pagination_class = PostPagination
+    related_fields = {'author': 'author__team', 'content': 'body'}
+    compiled_paths = {'content': 'body__content'}
+    compiled_annotations = ('liked_by_me', 'my_access')
+    max_query_length = 200
+
+    @extend_schema(
+        operation_id='search_posts',
+        description='Full-text search over the titles and bodies of the posts the user can read. '
+                    'Every word must match; title matches rank higher. Results are page-number paginated.',
+        parameters=[
+            OpenApiParameter(
+                name='q',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description='Search words, e.g. `django caching`'
+            ),
+            OpenApiParameter(
+                name='page',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description='Page number'
+            ),
+            FIELDS_PARAMETER,
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=PostSerializer(many=True),
+                description="Matching posts, best first"
+            ),
+            400: OpenApiResponse(description="Missing or invalid q"),
+        },
+        tags=['Posts']
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_search_query(self):
+        q = self.request.query_params.get('q', '').strip()
+        if not search.get_terms(q):
+            raise ValidationError({'q': 'Must contain at least one word'})
+        if len(q) > self.max_query_length:
+            raise ValidationError({'q': f'At most {self.max_query_length} characters are allowed'})
+        return q
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = self.select_requested_related(Post.objects.filter(get_readable_posts_query(user)))
+        queryset = search.search_posts(self.prune_queryset(queryset), self.get_search_query())
+
+        return annotate_viewer_state(
+            queryset.order_by('-rank', '-id'), user,
+            liked_by_me=self.wants_field('liked_by_me'), my_access=self.wants_field('my_access'),
+        )
+
+class PostSuggestView(APIView):
+    """
+    GET -> id and title of the top readable posts matching a typed prefix (typeahead)
+    """
+    default_limit = 10
+    max_limit = 20
+    max_query_length = 100
+
+    @extend_schema(
+        operation_id='suggest_posts',
+        description='As-you-type title suggestions among the posts the user can read: titles starting with q first, '
+                    'in title order, then fuzzy matches. Results are cached per user in the server process for a few seconds.',
+        parameters=[
+            OpenApiParameter(
+                name='q',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description='Typed text, e.g. `djan`'
+            ),
+            OpenApiParameter(
+                name='limit',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description='Number of suggestions, 1 to 20 (default 10)'
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description="[{'id': int, 'title': str}, ...]"),
+            400: OpenApiResponse(description="Missing or invalid q or limit"),
+        },
+        tags=['Posts']
+    )
+    def get(self, request, *args, **kwargs):
+        q = ' '.join(request.query_params.get('q', '').split())
+        if not q:
+            raise ValidationError({'q': 'This parameter is required'})
+        if len(q) > self.max_query_length:
+            raise ValidationError({'q': f'At most {self.max_query_length} characters are allowed'})
+        limit = self.get_limit()
+
+        key = (*suggest.get_viewer_key(request.user), suggest.fold_case(q), limit)
+        results = suggest.suggestions.get(key)
+        if results is None:
+            queryset = Post.objects.filter(get_readable_posts_query(request.user))
+            results = suggest.suggest_titles(queryset, q, limit)
+            suggest.suggestions.set(key, results)
+        return Response(results)
+
+    def get_limit(self):
+        raw = self.request.query_params.get('limit')
+        if raw is None:
+            return self.default_limit
+        try:
+            limit = int(raw)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer'})
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({'limit': f'Must be between 1 and {self.max_limit}'})
+        return limit
+
 class PostUpdateView(generics.UpdateAPIView):
     """
     PUT/PATCH -> update post content, title, and permissions
     Editing follows the permissions set on the post before the edit attempt
     """
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related('author__team', 'body')
     serializer_class = PostUpdateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -113,6 +402,10 @@ class PostUpdateView(generics.UpdateAPIView):
         kwargs['partial'] = True
         return self.update(request, *args, **kwargs)
 
+    def get_queryset(self):
+        # my_access is left to the serializer, the update may change the access columns
+        return annotate_viewer_state(super().get_queryset(), self.request.user, my_access=False)
+
     def get_object(self):
         post = super().get_object()
         user = self.request.user
@@ -136,7 +429,7 @@ class PostUpdateView(generics.UpdateAPIView):
         read_serializer = PostSerializer(write_serializer.instance, context=self.get_serializer_context())
         return Response(read_serializer.data)
     
-class PostDetailView(generics.RetrieveAPIView):
+class PostDetailView(ConditionalGetMixin, AnonymousResponseCacheMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
 
     """
     GET -> get specific post details (returns 404 if user doesn't have read access)
@@ -144,15 +437,18 @@ class PostDetailView(generics.RetrieveAPIView):
     
     serializer_class = PostDetailSerializer
     queryset = Post.objects.all()
+    related_fields = {'author': 'author__team', 'content': 'body'}
 
     @extend_schema(
         operation_id='retrieve_post',
         description='Get detailed view of a specific post. Returns 404 if user does not have read access.',
+        parameters=[FIELDS_PARAMETER],
         responses={
             200: OpenApiResponse(
                 response=PostDetailSerializer,
                 description="Post details"
             ),
+            304: OpenApiResponse(description="Not modified since the If-None-Match / If-Modified-Since validators"),
             404: OpenApiResponse(description="Post not found or no access"),
         },
         tags=['Posts']
@@ -161,15 +457,84 @@ class PostDetailView(generics.RetrieveAPIView):
         """Get post details with permission check"""
         return super().get(request, *args, **kwargs)
 
-    def get_object(self):
-        post = super().get_object()
-        user = self.request.user
+    def get_cache_generations(self):
+        return [post_generation(self.kwargs['pk']), AUTHORS_GENERATION]
 
-        if not user_can_read_post(user, post):
+    def get_validators(self):
+        # one primary key lookup on posts_post, no body or author join
+        row = Post.objects.filter(pk=self.kwargs['pk']).order_by().values_list('update_at', 'likes_count', *PERMISSION_VALUE_FIELDS).first()
+        if row is None or get_permission_level_from_values(self.request.user, *row[2:]) not in READABLE_LEVELS:
             raise NotFound("Post Not Found")
-        
+
+        update_at, likes_count, author_id, author_team_id = row[:4]
+        # author and team edits don't touch update_at, their cache generations move instead
+        generations = get_generations([author_generation(author_id), team_generation(author_team_id)])
+        return [update_at.isoformat(), likes_count, *generations], update_at
+
+    def get_queryset(self):
+        # the read permission check needs the access columns
+        queryset = self.select_requested_related(super().get_queryset())
+        return self.prune_queryset(queryset, required=PERMISSION_FIELDS)
+
+    def get_object(self):
+        lookup = {self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        post = get_readable_object_or_404(self.request.user, self.get_queryset(), **lookup)
+        self.check_object_permissions(self.request, post)
         return post
 
+class PostRelatedView(generics.ListAPIView):
+    """
+    GET -> readable posts related to a post, most similar first (precomputed, see posts.related)
+    """
+    serializer_class = RelatedPostSerializer
+    pagination_class = None
+    max_results = 10
+
+    @extend_schema(
+        operation_id='related_posts',
+        description='Posts with titles and excerpts similar to this post, most similar first, among the posts the user can read. '
+                    'Lists are precomputed by `manage.py build_related_posts` and empty until it has run.',
+        responses={
+            200: OpenApiResponse(
+                response=RelatedPostSerializer(many=True),
+                description="Up to 10 related posts"
+            ),
+            404: OpenApiResponse(description="Post not found or no access"),
+        },
+        tags=['Posts']
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        user = self.request.user
+        get_readable_object_or_404(user, Post.objects.only(*PERMISSION_FIELDS), pk=self.kwargs['pk'])
+
+        return Post.objects.filter(
+            get_readable_posts_query(user), related_from__post_id=self.kwargs['pk']
+        ).select_related('author__team').annotate(
+            score=F('related_from__score')
+        ).order_by('related_from__rank')[:self.max_results]
+
+class PostCacheStatsView(APIView):
+    """
+    GET -> hit/miss counters of the anonymous response cache (admins only)
+    """
+    permission_classes = [IsAdmin]
+
+    @extend_schema(
+        operation_id='post_cache_stats',
+        description='Hit and miss counters of the anonymous post list/detail response cache. '
+                    'Counters live in the cache backend, so they are per process with the default local memory cache.',
+        responses={
+            200: OpenApiResponse(description="{'hits': int, 'misses': int}"),
+            403: OpenApiResponse(description="Admins only"),
+        },
+        tags=['Posts']
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(get_stats())
+
 class PostDeleteView(generics.DestroyAPIView):
     """
     DELETE -> permanently delete post and all associated data
@@ -0,0 +1,63 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from .models import User
+from .serializers import UserSerializer
+
+INCLUDE_PARAMETER = OpenApiParameter(
+    name='include',
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    required=False,
+    enum=['users'],
+    description='`users` replaces the user of every row with its id (e.g. `author_id`) and lists '
+                'each distinct user of the page once under `included.users`, keyed by id.'
+)
+
+
+class SideloadUsersMixin:
+    """
+    Opt-in `?include=users` format for paginated list views: rows carry
+    `<sideloaded_user_field>_id` instead of the user, and the users of the
+    page are serialized once in the top level `included.users` map
+    """
+    sideloaded_user_field = 'user'
+    include_options = ['users']
+
+    def sideloads_users(self):
+        if not hasattr(self, '_sideloads_users'):
+            raw = self.request.query_params.get('include', '') if self.request.method == 'GET' else ''
+            include = {name.strip() for name in raw.split(',') if name.strip()}
+            unknown = include - set(self.include_options)
+            if unknown:
+                raise ValidationError({'include': f"Unknown include(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(self.include_options)}"})
+            self._sideloads_users = 'users' in include
+        return self._sideloads_users
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = getattr(serializer, 'child', serializer).fields
+        name = self.sideloaded_user_field
+
+        if name in fields and self.sideloads_users():
+            del fields[name]
+            fields[f'{name}_id'] = serializers.IntegerField(read_only=True)
+        return serializer
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.sideloads_users():
+            response.data['included'] = {'users': self.get_included_users(data)}
+        return response
+
+    def get_included_users(self, rows):
+        """The distinct users referenced by the page, in one query"""
+        key = f'{self.sideloaded_user_field}_id'
+        ids = {row[key] for row in rows if row.get(key) is not None}
+        if not ids:
+            return {}
+
+        users = User.objects.filter(pk__in=ids).select_related('team').order_by('pk')
+        return {str(user['id']): user for user in UserSerializer(users, many=True).data}